@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import os
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+from typing import Iterator, TextIO
+from compiler.constants import OUTPUT_BUFFER_SIZE
+
+EMIT_LLVM_IR = "ll"
+EMIT_BITCODE = "bc"
+EMIT_OBJECT = "obj"
+EMIT_EXECUTABLE = "exe"
+EMIT_KINDS = [EMIT_LLVM_IR, EMIT_BITCODE, EMIT_OBJECT, EMIT_EXECUTABLE]
+
+
+class BackendStage:
+    def __init__(self, name: str, command: list[str]):
+        self.name = name
+        self.command = command
+
+
+class BackendPipeline:
+    def __init__(self, emit: str, optimization_level: int, output_file: str):
+        self.emit = emit
+        self.output_file = output_file
+        self.stages = self.__build_stages(emit, optimization_level, output_file)
+        self.timings: list[tuple[str, float]] = []
+
+    @staticmethod
+    def __build_stages(emit: str, optimization_level: int, output_file: str) -> list[BackendStage]:
+        level = f"-O{optimization_level}"
+        if emit == EMIT_BITCODE:
+            return [BackendStage("opt", ["opt", level, "-o", output_file])]
+
+        stages = [BackendStage("opt", ["opt", level, "-o", "-"])]
+        if emit == EMIT_OBJECT:
+            return stages + [BackendStage("llc", ["llc", level, "-filetype=obj", "-relocation-model=pic",
+                                                  "-o", output_file])]
+        return stages + [BackendStage("llc", ["llc", level, "-filetype=asm", "-relocation-model=pic", "-o", "-"]),
+                         BackendStage("clang", ["clang", "-fPIE", "-x", "assembler", "-", "-o", output_file])]
+
+    @contextmanager
+    def open(self) -> Iterator[TextIO]:
+        for stage in self.stages:
+            if shutil.which(stage.command[0]) is None:
+                raise ValueError(f"'{stage.command[0]}' was not found on PATH, it is needed for --emit={self.emit}")
+
+        started = time.perf_counter()
+        processes = self.__spawn()
+        try:
+            try:
+                yield processes[0].stdin
+                processes[0].stdin.close()
+            except BrokenPipeError:
+                pass
+            self.timings = [("frontend", time.perf_counter() - started)]
+            self.__wait(processes, started)
+        except BaseException:
+            for process in processes:
+                process.kill()
+                process.wait()
+            if os.path.exists(self.output_file):
+                os.remove(self.output_file)
+            raise
+
+    def __spawn(self) -> list[subprocess.Popen]:
+        processes, stdin = [], subprocess.PIPE
+        for index, stage in enumerate(self.stages):
+            stdout = subprocess.PIPE if index < len(self.stages) - 1 else subprocess.DEVNULL
+            process = subprocess.Popen(stage.command, stdin=stdin, stdout=stdout, stderr=subprocess.PIPE,
+                                       text=True, bufsize=OUTPUT_BUFFER_SIZE)
+            if processes:
+                processes[-1].stdout.close()
+            processes.append(process)
+            stdin = process.stdout
+        return processes
+
+    def __wait(self, processes: list[subprocess.Popen], started: float):
+        finished = started + self.timings[0][1]
+        for stage, process in zip(self.stages, processes):
+            errors = process.stderr.read()
+            if process.wait() != 0:
+                raise ValueError(f"{stage.name} exited with code {process.returncode}: {errors.strip()}")
+            now = time.perf_counter()
+            self.timings.append((stage.name, now - finished))
+            finished = now
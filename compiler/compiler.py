@@ -1,29 +1,93 @@
 #!/usr/bin/env python3
 import os.path
 import sys
+from contextlib import contextmanager
+from typing import ContextManager, Iterator, TextIO
 from .lexer.lexer import Lexer
 import argparse
-from .visitor.code_generator.code_generator import CodeGenerator
-from compiler.visitor.semantic_analyzer.semantic_analyzer import SemanticAnalyzer
-from compiler.syntax_parser.syntax_parser import SyntaxParser
+from .visitor.code_generator.struct_abi import POINTER_ABI, REGISTER_ABI
+from compiler.streaming_pipeline import StreamingPipeline
+from compiler.backend_pipeline import BackendPipeline, EMIT_KINDS, EMIT_LLVM_IR
+from compiler.helpers.timing_report import print_timing_report
+from compiler.pass_manager.pass_context import PassContext
+from compiler.pass_manager.pass_manager import PassManager
+from compiler.pass_manager.pass_registry import (FRONTEND_PASSES, BACKEND_PASSES, OPTIMIZATION_PASSES,
+                                                 OPTIMIZATION_PIPELINES, INLINING_LEVEL, PassRegistry)
+from compiler.visitor.code_generator.codegen_options import CodegenOptions
+from compiler.constants import (DEFAULT_INLINE_THRESHOLD, DEFAULT_SPECIALIZATION_BUDGET, DEFAULT_OPTIMIZATION_LEVEL,
+                                OUTPUT_BUFFER_SIZE)
 
 
 class Compiler:
     def __init__(self):
-        self.input_file, self.output_file = self.__parse_arguments()
+        (self.input_file, self.output_file, self.specialization_budget,
+         self.print_stats, self.streaming, self.optimization_passes, self.codegen_options,
+         self.time_passes, self.print_after, self.verify_each,
+         self.emit, self.optimization_level) = self.__parse_arguments()
+        self.backend = None
 
     @staticmethod
-    def __parse_arguments() -> tuple[str, str]:
+    def __parse_arguments() -> tuple[str, str, int, bool, bool, list[str], CodegenOptions, bool, set[str], bool,
+                                     str, int]:
         parser = argparse.ArgumentParser()
         parser.add_argument('input_file', help="Input file that contains source code")
-        parser.add_argument('output_file', help="Output LLVM IR file")
+        parser.add_argument('output_file', help="Output file, its kind is selected with --emit")
+        parser.add_argument('--emit', choices=EMIT_KINDS, default=EMIT_LLVM_IR,
+                            help="Write LLVM IR as generated, or pipe it through opt, llc and clang "
+                                 "to produce bitcode, an object file or an executable")
+        parser.add_argument('-O', dest='optimization_level', type=int, choices=sorted(OPTIMIZATION_PIPELINES),
+                            default=DEFAULT_OPTIMIZATION_LEVEL,
+                            help="Optimization level (-O0, -O1 or -O2) selecting the AST pass pipeline and the "
+                                 "code generator optimizations, also passed to opt and llc")
+        parser.add_argument('--passes', type=lambda value: [name for name in value.split(',') if name],
+                            help=f"Comma-separated AST pass pipeline that overrides the one chosen by -O, "
+                                 f"built from: {', '.join(OPTIMIZATION_PASSES)}")
+        parser.add_argument('--time-passes', action='store_true',
+                            help="Print the wall time spent in each pass")
+        parser.add_argument('--print-after', action='append', default=[],
+                            choices=FRONTEND_PASSES + OPTIMIZATION_PASSES + BACKEND_PASSES,
+                            help="Print the tokens, AST or IR after the given pass (can be repeated)")
+        parser.add_argument('--verify-each', action='store_true',
+                            help="Debug mode: re-check the program semantics after every AST transformation")
+        parser.add_argument('--inline-threshold', type=int,
+                            help=f"Maximum estimated size of a function body that gets inlined (0 disables inlining, "
+                                 f"defaults to {DEFAULT_INLINE_THRESHOLD} at -O{INLINING_LEVEL} and 0 below)")
+        parser.add_argument('--specialization-budget', type=int, default=DEFAULT_SPECIALIZATION_BUDGET,
+                            help="Total estimated size of function clones specialized on constant arguments "
+                                 "(0 disables specialization)")
+        parser.add_argument('--memoize', action='store_true',
+                            help="Cache results of pure recursive functions in fixed-size global tables")
+        parser.add_argument('--no-signed-wrap', action='store_true',
+                            help="Assume integer arithmetic never overflows and mark it nsw")
+        parser.add_argument('--struct-abi', choices=[POINTER_ABI, REGISTER_ABI], default=POINTER_ABI,
+                            help="Pass small struct arguments through a pointer or as scalar fields in registers")
+        parser.add_argument('--stats', action='store_true',
+                            help="Print how many times each optimizer rewrite rule fired")
+        parser.add_argument('--no-peephole', action='store_true',
+                            help="Skip the peephole rewrites applied to the emitted LLVM IR")
+        parser.add_argument('--streaming', action='store_true',
+                            help="Parse, analyze and emit one top-level declaration at a time to bound memory "
+                                 "(disables inlining, specialization, memoization and the register struct ABI)")
         args = parser.parse_args()
 
         if not os.path.exists(args.input_file):
             print(f"File '{args.input_file}' was not found!")
             sys.exit(1)
 
-        return args.input_file, args.output_file
+        if "codegen" in args.print_after and args.emit != EMIT_LLVM_IR:
+            parser.error("--print-after=codegen needs --emit=ll")
+
+        optimize = args.optimization_level > 0
+        inline_threshold = args.inline_threshold if args.inline_threshold is not None \
+            else DEFAULT_INLINE_THRESHOLD if args.optimization_level >= INLINING_LEVEL else 0
+        codegen_options = CodegenOptions(inline_threshold, args.memoize, args.no_signed_wrap, args.struct_abi,
+                                         optimize and not args.no_peephole, optimize)
+        optimization_passes = args.passes if args.passes is not None \
+            else OPTIMIZATION_PIPELINES[args.optimization_level]
+
+        return (args.input_file, args.output_file, args.specialization_budget, args.stats,
+                args.streaming, optimization_passes, codegen_options, args.time_passes, set(args.print_after),
+                args.verify_each, args.emit, args.optimization_level)
 
     @staticmethod
     def __read_source_file(file_name: str) -> str:
@@ -31,9 +95,21 @@ class Compiler:
             return file.read()
 
     @staticmethod
-    def __write_output_file(file_name: str, content: str):
-        with open(file_name, 'w') as file:
-            file.write(content)
+    @contextmanager
+    def __open_output_file(file_name: str) -> Iterator[TextIO]:
+        try:
+            with open(file_name, 'w', buffering=OUTPUT_BUFFER_SIZE) as file:
+                yield file
+        except BaseException:
+            if os.path.exists(file_name):
+                os.remove(file_name)
+            raise
+
+    def __open_output(self) -> ContextManager[TextIO]:
+        if self.emit == EMIT_LLVM_IR:
+            return self.__open_output_file(self.output_file)
+        self.backend = BackendPipeline(self.emit, self.optimization_level, self.output_file)
+        return self.backend.open()
 
     @staticmethod
     def __get_tokens(source_code: str) -> list:
@@ -41,32 +117,41 @@ class Compiler:
         return lexer.tokenize()
 
     @staticmethod
-    def __get_ast(tokens: list):
-        parser = SyntaxParser(tokens)
-        return parser.parse_program()
-
-    @staticmethod
-    def __analyze_semantics(ast):
-        semantic_analyzer = SemanticAnalyzer()
-        ast.accept(semantic_analyzer)
-
-    @staticmethod
-    def __generate_code(ast) -> str:
-        code_generator = CodeGenerator()
-        return ast.accept(code_generator)
-
-    def __compile(self) -> str:
+    def __print_rule_counts(pass_name: str, rule_counts: dict[str, int]):
+        for rule, count in sorted(rule_counts.items()):
+            print(f"{count:>6} {pass_name} - {rule}", file=sys.stderr)
+
+    def __compile_streaming(self):
+        tokens = self.__get_tokens(self.__read_source_file(self.input_file))
+        with self.__open_output() as output:
+            pipeline = StreamingPipeline(tokens, output, self.codegen_options, self.optimization_passes)
+            pipeline.run()
+        if self.print_stats:
+            if pipeline.simplifier:
+                self.__print_rule_counts("algebraic-simplifier", pipeline.simplifier.rule_counts)
+            if pipeline.eliminator:
+                self.__print_rule_counts("dead-code-eliminator", pipeline.eliminator.rule_counts)
+            if pipeline.code_generator.emitter.peephole:
+                self.__print_rule_counts("peephole", pipeline.code_generator.emitter.peephole.hit_counts)
+
+    def __compile(self):
         source_code = self.__read_source_file(self.input_file)
-        tokens = self.__get_tokens(source_code)
-        ast = self.__get_ast(tokens)
-        self.__analyze_semantics(ast)
-        llvm_ir = self.__generate_code(ast)
-        return llvm_ir
+        passes = PassRegistry(self.specialization_budget).build(self.optimization_passes)
+        pass_manager = PassManager(passes, self.print_after, self.verify_each)
+        with self.__open_output() as output:
+            context = PassContext(source_code, output, self.codegen_options)
+            pass_manager.run(context)
+        if self.time_passes:
+            print_timing_report(pass_manager.timings)
+        if self.print_stats:
+            for pass_name, rule_counts in context.rule_counts:
+                self.__print_rule_counts(pass_name, rule_counts)
 
     def run_program(self):
         try:
-            translated_code = self.__compile()
-            self.__write_output_file(self.output_file, translated_code)
+            self.__compile_streaming() if self.streaming else self.__compile()
+            if self.time_passes and self.backend:
+                print_timing_report(self.backend.timings)
             print(f"Successfully compiled '{self.input_file}' to '{self.output_file}'")
             sys.exit(0)
 
@@ -3,6 +3,8 @@ from .token.token_type import TokenType
 
 I32_MIN = -2147483648
 I32_MAX = 2147483647
+I64_MIN = -9223372036854775808
+I64_MAX = 9223372036854775807
 
 GLOBAL_SCOPE = "global"
 
@@ -20,6 +22,11 @@ OPERATORS = '+-*='
 
 CALLABLE = "call"
 
+DEFAULT_INLINE_THRESHOLD = 20
+DEFAULT_SPECIALIZATION_BUDGET = 200
+DEFAULT_OPTIMIZATION_LEVEL = 2
+OUTPUT_BUFFER_SIZE = 1 << 16
+
 KEYWORDS: dict = {
     "i32": TokenType.I32_TYPE,
     "mut": TokenType.MUT,
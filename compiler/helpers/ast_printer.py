@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+from enum import Enum
+from ..node.ast_node import ASTNode
+
+
+class ASTPrinter:
+    def __init__(self, indent: str = "  "):
+        self.indent = indent
+        self.lines: list[str] = []
+
+    def render(self, node: ASTNode) -> str:
+        self.lines = []
+        self.__render_node(node, "", 0)
+        return "\n".join(self.lines)
+
+    def __render_node(self, node: ASTNode, label: str, depth: int):
+        attributes = {}
+        for name, value in vars(node).items():
+            if not any(value is seen for seen in attributes.values()):
+                attributes[name] = value
+        scalars = [f"{name}={self.__format(value)}" for name, value in attributes.items()
+                   if not self.__is_child(value)]
+        self.lines.append(f"{self.indent * depth}{label}{type(node).__name__}({', '.join(scalars)})")
+        for name, value in attributes.items():
+            if self.__is_child(value):
+                for child in value if isinstance(value, list) else [value]:
+                    self.__render_node(child, f"{name}: ", depth + 1)
+
+    @staticmethod
+    def __is_child(value) -> bool:
+        if isinstance(value, list):
+            return bool(value) and all(isinstance(item, ASTNode) for item in value)
+        return isinstance(value, ASTNode)
+
+    @staticmethod
+    def __format(value) -> str:
+        if isinstance(value, Enum):
+            return value.name.lower()
+        if isinstance(value, list):
+            return f"[{', '.join(ASTPrinter.__format(item) for item in value)}]"
+        if type(value).__str__ is object.__str__ and hasattr(value, "__dict__"):
+            return " ".join(ASTPrinter.__format(attribute) for attribute in vars(value).values())
+        return str(value)
@@ -0,0 +1,10 @@
+#!/usr/bin/env python3
+import sys
+
+
+def print_timing_report(timings: list[tuple[str, float]]):
+    total = sum(seconds for _, seconds in timings)
+    for name, seconds in timings:
+        share = seconds / total * 100 if total else 0.0
+        print(f"{seconds:>9.4f}s {share:>5.1f}% {name}", file=sys.stderr)
+    print(f"{total:>9.4f}s 100.0% total", file=sys.stderr)
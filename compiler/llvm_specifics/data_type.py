@@ -3,13 +3,14 @@ from enum import Enum
 
 
 class DataType(Enum):
-    I32 = ("i32", "i32")
-    I64 = ("i64", "i64")
-    BOOL = ("bool", "i1")
+    I32 = ("i32", "i32", 4)
+    I64 = ("i64", "i64", 8)
+    BOOL = ("bool", "i1", 1)
 
-    def __init__(self, keyword: str, llvm_representation: str):
+    def __init__(self, keyword: str, llvm_representation: str, size_in_bytes: int):
         self.keyword = keyword
         self.llvm_representation = llvm_representation
+        self.size_in_bytes = size_in_bytes
 
     @staticmethod
     def from_string(type_str: str) -> 'DataType':
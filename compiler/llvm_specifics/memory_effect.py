@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+from enum import Enum
+
+
+class MemoryEffect(Enum):
+    READ_NONE = ("readnone", "readnone", 0)
+    READ_ONLY = ("readonly", "readonly", 1)
+    WRITES = ("writes", "", 2)
+
+    def __init__(self, keyword: str, llvm_representation: str, rank: int):
+        self.keyword = keyword
+        self.llvm_representation = llvm_representation
+        self.rank = rank
+
+    def to_llvm(self) -> str:
+        return self.llvm_representation
+
+    def join(self, other: 'MemoryEffect') -> 'MemoryEffect':
+        return self if self.rank >= other.rank else other
+
+    def __str__(self) -> str:
+        return self.keyword
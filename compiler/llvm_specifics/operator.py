@@ -6,8 +6,9 @@ class Operator(Enum):
     PLUS = ('+', 'add')
     MINUS = ('-', 'sub')
     MULTIPLY = ('*', 'mul')
-    EQUALS = ("==", 'icmp eq')
-    NOT_EQUALS = ("!=", 'icmp ne')
+    EQUALS = ("==", 'eq')
+    NOT_EQUALS = ("!=", 'ne')
+    SHIFT_LEFT = ('<<', 'shl')
 
 
     def __init__(self, symbol: str, llvm_operator: str):
@@ -31,4 +32,4 @@ class Operator(Enum):
         return self in (Operator.EQUALS, Operator.NOT_EQUALS)
 
     def is_for_arithmetic(self) -> bool:
-        return self in (Operator.PLUS, Operator.MINUS, Operator.MULTIPLY)
+        return self in (Operator.PLUS, Operator.MINUS, Operator.MULTIPLY, Operator.SHIFT_LEFT)
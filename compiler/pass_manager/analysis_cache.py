@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+from typing import Callable
+from ..node.program_node import ProgramNode
+from ..visitor.analysis.binding_resolver import BindingResolver
+from ..visitor.analysis.side_effect_analyzer import SideEffectAnalyzer
+
+CALL_GRAPH = "call-graph"
+BINDINGS = "bindings"
+
+ANALYSES: dict[str, Callable[[ProgramNode], object]] = {
+    CALL_GRAPH: lambda program: SideEffectAnalyzer().analyze(program),
+    BINDINGS: lambda program: BindingResolver().resolve(program),
+}
+
+
+class AnalysisCache:
+    def __init__(self):
+        self.results: dict[str, object] = {}
+
+    def get(self, name: str, program: ProgramNode):
+        if name not in self.results:
+            self.results[name] = ANALYSES[name](program)
+        return self.results[name]
+
+    def invalidate(self, preserved: tuple[str, ...]):
+        self.results = {name: result for name, result in self.results.items() if name in preserved}
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+from .analysis_cache import BINDINGS, CALL_GRAPH
+from .compiler_pass import CompilerPass
+from .pass_context import PassContext
+from ..visitor.code_generator.code_generator import CodeGenerator
+
+
+class CodeGenerationPass(CompilerPass):
+    name = "codegen"
+    provides = ("ir",)
+    preserves = (CALL_GRAPH, BINDINGS)
+
+    def run(self, context: PassContext):
+        code_generator = CodeGenerator(context.options, context.output)
+        code_generator.generate_program(context.program, context.analysis(CALL_GRAPH))
+        context.artifacts["ir"] = context.output
+        if code_generator.emitter.peephole:
+            context.rule_counts.append(("peephole", code_generator.emitter.peephole.hit_counts))
+
+    def dump(self, context: PassContext) -> str:
+        context.output.flush()
+        with open(context.output.name, 'r') as file:
+            return file.read()
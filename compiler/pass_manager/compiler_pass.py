@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+from abc import ABC, abstractmethod
+from ..helpers.ast_printer import ASTPrinter
+from .pass_context import PassContext
+
+
+class CompilerPass(ABC):
+    name = ""
+    requires: tuple[str, ...] = ("ast", "semantics")
+    provides: tuple[str, ...] = ("ast",)
+    preserves: tuple[str, ...] = ()
+
+    @abstractmethod
+    def run(self, context: PassContext):
+        pass
+
+    def dump(self, context: PassContext) -> str:
+        return ASTPrinter().render(context.program)
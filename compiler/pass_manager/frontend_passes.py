@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+from .analysis_cache import BINDINGS, CALL_GRAPH
+from .compiler_pass import CompilerPass
+from .pass_context import PassContext
+from ..lexer.lexer import Lexer
+from ..syntax_parser.syntax_parser import SyntaxParser
+from ..visitor.semantic_analyzer.semantic_analyzer import SemanticAnalyzer
+
+
+class LexPass(CompilerPass):
+    name = "lex"
+    requires = ("source",)
+    provides = ("tokens",)
+
+    def run(self, context: PassContext):
+        context.artifacts["tokens"] = Lexer(context.artifacts["source"]).tokenize()
+
+    def dump(self, context: PassContext) -> str:
+        return "\n".join(repr(token) for token in context.artifacts["tokens"])
+
+
+class ParsePass(CompilerPass):
+    name = "parse"
+    requires = ("tokens",)
+
+    def run(self, context: PassContext):
+        context.artifacts["ast"] = SyntaxParser(context.artifacts["tokens"]).parse_program()
+
+
+class AnalyzePass(CompilerPass):
+    name = "analyze"
+    requires = ("ast",)
+    provides = ("semantics",)
+    preserves = (CALL_GRAPH, BINDINGS)
+
+    def run(self, context: PassContext):
+        semantic_analyzer = SemanticAnalyzer()
+        context.program.accept(semantic_analyzer)
+        context.artifacts["semantics"] = semantic_analyzer.context
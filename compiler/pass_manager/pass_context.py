@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+from typing import TextIO
+from .analysis_cache import AnalysisCache
+from ..visitor.code_generator.codegen_options import CodegenOptions
+
+
+class PassContext:
+    def __init__(self, source_code: str, output: TextIO, options: CodegenOptions):
+        self.artifacts: dict[str, object] = {"source": source_code}
+        self.analyses = AnalysisCache()
+        self.output = output
+        self.options = options
+        self.rule_counts: list[tuple[str, dict[str, int]]] = []
+
+    @property
+    def program(self):
+        return self.artifacts["ast"]
+
+    def analysis(self, name: str):
+        return self.analyses.get(name, self.program)
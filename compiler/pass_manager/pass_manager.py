@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+import sys
+import time
+from .compiler_pass import CompilerPass
+from .pass_context import PassContext
+from ..visitor.semantic_analyzer.semantic_analyzer import SemanticAnalyzer
+
+
+class PassManager:
+    def __init__(self, passes: list[CompilerPass], print_after: set[str], verify_each: bool):
+        self.passes = passes
+        self.print_after = print_after
+        self.verify_each = verify_each
+        self.timings: list[tuple[str, float]] = []
+
+    def run(self, context: PassContext):
+        for compiler_pass in self.passes:
+            self.__check_inputs(compiler_pass, context)
+            started = time.perf_counter()
+            compiler_pass.run(context)
+            self.timings.append((compiler_pass.name, time.perf_counter() - started))
+            context.analyses.invalidate(compiler_pass.preserves)
+
+            if self.verify_each and "semantics" in context.artifacts and "ast" in compiler_pass.provides:
+                self.__verify(compiler_pass, context)
+            if compiler_pass.name in self.print_after:
+                print(f"*** {compiler_pass.name} ***", file=sys.stderr)
+                print(compiler_pass.dump(context), file=sys.stderr)
+
+    @staticmethod
+    def __check_inputs(compiler_pass: CompilerPass, context: PassContext):
+        missing = [name for name in compiler_pass.requires if name not in context.artifacts]
+        if missing:
+            raise ValueError(f"Pass '{compiler_pass.name}' requires '{missing[0]}', "
+                             f"which no earlier pass provides")
+
+    @staticmethod
+    def __verify(compiler_pass: CompilerPass, context: PassContext):
+        try:
+            context.program.accept(SemanticAnalyzer())
+        except ValueError as e:
+            raise ValueError(f"Invariant broken after pass '{compiler_pass.name}': {e}")
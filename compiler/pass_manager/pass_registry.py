@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+from typing import Callable
+from .code_generation_pass import CodeGenerationPass
+from .compiler_pass import CompilerPass
+from .frontend_passes import AnalyzePass, LexPass, ParsePass
+from .transform_passes import DeadCodePass, FoldPass, SpecializePass
+
+FRONTEND_PASSES = ["lex", "parse", "analyze"]
+OPTIMIZATION_PASSES = ["specialize", "fold", "dce"]
+BACKEND_PASSES = ["codegen"]
+OPTIMIZATION_PIPELINES = {
+    0: [],
+    1: ["fold", "dce"],
+    2: ["specialize", "fold", "dce"],
+}
+INLINING_LEVEL = 2
+
+
+class PassRegistry:
+    def __init__(self, specialization_budget: int):
+        self.factories: dict[str, Callable[[], CompilerPass]] = {
+            "lex": LexPass,
+            "parse": ParsePass,
+            "analyze": AnalyzePass,
+            "specialize": lambda: SpecializePass(specialization_budget),
+            "fold": FoldPass,
+            "dce": DeadCodePass,
+            "codegen": CodeGenerationPass,
+        }
+
+    def build(self, optimization_passes: list[str]) -> list[CompilerPass]:
+        unknown = [name for name in optimization_passes if name not in OPTIMIZATION_PASSES]
+        if unknown:
+            raise ValueError(f"Unknown optimization pass '{unknown[0]}', "
+                             f"expected one of: {', '.join(OPTIMIZATION_PASSES)}")
+        return [self.factories[name]() for name in FRONTEND_PASSES + optimization_passes + BACKEND_PASSES]
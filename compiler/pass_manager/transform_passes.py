@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+from .analysis_cache import BINDINGS
+from .compiler_pass import CompilerPass
+from .pass_context import PassContext
+from ..visitor.optimizer.algebraic_simplifier import AlgebraicSimplifier
+from ..visitor.optimizer.dead_code_eliminator import DeadCodeEliminator
+from ..visitor.optimizer.function_specializer import FunctionSpecializer
+
+
+class SpecializePass(CompilerPass):
+    name = "specialize"
+
+    def __init__(self, budget: int):
+        self.budget = budget
+
+    def run(self, context: PassContext):
+        FunctionSpecializer(self.budget).specialize(context.program)
+
+
+class FoldPass(CompilerPass):
+    name = "fold"
+
+    def run(self, context: PassContext):
+        simplifier = AlgebraicSimplifier()
+        context.program.accept(simplifier)
+        context.rule_counts.append(("algebraic-simplifier", simplifier.rule_counts))
+
+
+class DeadCodePass(CompilerPass):
+    name = "dce"
+    preserves = (BINDINGS,)
+
+    def run(self, context: PassContext):
+        eliminator = DeadCodeEliminator()
+        eliminator.eliminate(context.program, context.analysis(BINDINGS))
+        context.rule_counts.append(("dead-code-eliminator", eliminator.rule_counts))
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+from typing import Optional, TextIO
+from compiler.node.function_decl_node import FunctionDeclNode
+from compiler.node.program_node import ProgramNode
+from compiler.node.struct_decl_node import StructDeclNode
+from compiler.syntax_parser.syntax_parser import SyntaxParser
+from compiler.visitor.code_generator.code_generator import CodeGenerator
+from compiler.visitor.code_generator.codegen_options import CodegenOptions
+from compiler.visitor.code_generator.struct_abi import POINTER_ABI
+from compiler.visitor.optimizer.algebraic_simplifier import AlgebraicSimplifier
+from compiler.visitor.optimizer.dead_code_eliminator import DeadCodeEliminator
+from compiler.visitor.semantic_analyzer.semantic_analyzer import SemanticAnalyzer
+
+
+class StreamingPipeline:
+    def __init__(self, tokens: list, output: TextIO, options: CodegenOptions, optimization_passes: list[str]):
+        self.tokens = tokens
+        self.semantic_analyzer = SemanticAnalyzer()
+        self.simplifier: Optional[AlgebraicSimplifier] = AlgebraicSimplifier() if "fold" in optimization_passes else None
+        self.eliminator: Optional[DeadCodeEliminator] = DeadCodeEliminator() if "dce" in optimization_passes else None
+        options.inline_threshold, options.memoize, options.struct_abi = 0, False, POINTER_ABI
+        self.code_generator = CodeGenerator(options, output)
+
+    def run(self):
+        signatures = self.__collect_signatures()
+        self.semantic_analyzer.declare_signatures(signatures.struct_decls, signatures.func_decls)
+        if self.simplifier:
+            self.simplifier.declare_signatures(signatures.struct_decls, signatures.func_decls)
+        self.code_generator.begin_streaming(signatures)
+
+        parser = SyntaxParser(self.tokens)
+        for declaration in parser.iterate_program():
+            parser.stream.release_consumed()
+            if isinstance(declaration, FunctionDeclNode):
+                self.__compile_fragment(ProgramNode([], [declaration], [], None))
+            elif isinstance(declaration, ProgramNode):
+                self.__compile_fragment(declaration)
+
+    def __collect_signatures(self) -> ProgramNode:
+        struct_decls, func_decls = [], []
+        for declaration in SyntaxParser(self.tokens).iterate_signatures():
+            (struct_decls if isinstance(declaration, StructDeclNode) else func_decls).append(declaration)
+        return ProgramNode(struct_decls, func_decls, [], None)
+
+    def __compile_fragment(self, fragment: ProgramNode):
+        fragment.accept(self.semantic_analyzer)
+        if self.simplifier:
+            fragment.accept(self.simplifier)
+        if self.eliminator:
+            self.eliminator.eliminate(fragment)
+        self.code_generator.generate_fragment(fragment)
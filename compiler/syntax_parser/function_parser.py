@@ -13,6 +13,11 @@ class FunctionParser:
         self.parent = parent_parser
 
     def parse_function_declaration(self) -> FunctionDeclNode:
+        signature = self.parse_function_signature()
+        signature.body = self._parse_code_block()
+        return signature
+
+    def parse_function_signature(self) -> FunctionDeclNode:
         self.stream.expect_token(TokenType.FN)
         func_name_token = self.stream.expect_token(TokenType.VARIABLE)
         self.stream.expect_token(TokenType.ASSIGNMENT)
@@ -22,9 +27,20 @@ class FunctionParser:
         self.stream.expect_token(TokenType.ARROW)
         return_type = self.parse_type(self.stream, self.parent.declared_structs)
         self.stream.consume_newline_and_skip()
-        body = self._parse_code_block()
 
-        return FunctionDeclNode(func_name_token.value, params, return_type, body, func_name_token.line)
+        return FunctionDeclNode(func_name_token.value, params, return_type, None, func_name_token.line)
+
+    def skip_code_block(self):
+        self.stream.expect_token(TokenType.LEFT_BRACKET)
+        depth = 1
+        while depth:
+            token = self.stream.eat()
+            if not token:
+                raise ValueError("Code block must end with }!")
+            if token.token_type == TokenType.LEFT_BRACKET:
+                depth += 1
+            elif token.token_type == TokenType.RIGHT_BRACKET:
+                depth -= 1
 
     def parse_function_call(self, func_name: str, line: int,
                            field_chain: Optional[FieldChain] = None) -> FunctionCallNode:
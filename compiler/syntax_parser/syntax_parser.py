@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
+from typing import Iterator, Union
+from ..node.function_decl_node import FunctionDeclNode
 from ..node.program_node import ProgramNode
+from ..node.struct_decl_node import StructDeclNode
 from ..token.token_class import Token
 from ..token.token_type import TokenType
 from .token_stream import TokenStream
@@ -33,18 +36,38 @@ class SyntaxParser:
             self.function_parser.parse_function_declaration
         )
 
+        main_body = self._parse_main_body()
+        return ProgramNode(struct_declarations, func_declarations, main_body.statement_nodes, main_body.return_node)
+
+    def iterate_program(self) -> Iterator[Union[StructDeclNode, FunctionDeclNode, ProgramNode]]:
+        self.stream.skip_newlines()
+        yield from self._iterate_declaration_block(TokenType.STRUCT, self.struct_parser.parse_struct_declaration)
+        yield from self._iterate_declaration_block(TokenType.FN, self.function_parser.parse_function_declaration)
+        yield self._parse_main_body()
+
+    def iterate_signatures(self) -> Iterator[Union[StructDeclNode, FunctionDeclNode]]:
+        self.stream.skip_newlines()
+        yield from self._iterate_declaration_block(TokenType.STRUCT, self.struct_parser.parse_struct_declaration)
+        yield from self._iterate_declaration_block(TokenType.FN, self._parse_function_signature_only)
+
+    def _parse_function_signature_only(self) -> FunctionDeclNode:
+        signature = self.function_parser.parse_function_signature()
+        self.function_parser.skip_code_block()
+        return signature
+
+    def _parse_main_body(self) -> ProgramNode:
         statements = self.statement_parser.parse_statements()
         return_statement = self.statement_parser.parse_program_return()
         self._check_program_end()
-
-        return ProgramNode(struct_declarations, func_declarations, statements, return_statement)
+        return ProgramNode([], [], statements, return_statement)
 
     def _parse_declaration_block(self, start_token_type, parse_function):
-        decls = []
+        return list(self._iterate_declaration_block(start_token_type, parse_function))
+
+    def _iterate_declaration_block(self, start_token_type, parse_function):
         while self.stream.peek() and self.stream.peek().token_type == start_token_type:
-            decls.append(parse_function())
+            yield parse_function()
             self.stream.consume_newline_and_skip()
-        return decls
 
     def _check_program_end(self):
         if self.stream.peek() and self.stream.peek().token_type != TokenType.THE_END:
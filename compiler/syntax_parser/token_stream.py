@@ -8,6 +8,7 @@ class TokenStream:
     def __init__(self, tokens: list[Token]):
         self.tokens = tokens
         self.current_index = 0
+        self.released_index = 0
 
     def peek(self) -> Token:
         return self.tokens[self.current_index] if self.current_index < len(self.tokens) else None
@@ -48,6 +49,11 @@ class TokenStream:
         self.expect_newline_or_end()
         self.skip_newlines()
 
+    def release_consumed(self):
+        for index in range(self.released_index, self.current_index):
+            self.tokens[index] = None
+        self.released_index = self.current_index
+
     def save_position(self) -> int:
         return self.current_index
 
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+from typing import Optional
+from ..ast_walker import ASTWalker
+from ...node.decl_node import DeclNode
+from ...node.program_node import ProgramNode
+
+
+class BindingResolver(ASTWalker):
+    def __init__(self):
+        self.scopes: list[dict[str, Optional[DeclNode]]] = [{}]
+        self.bindings: dict[int, DeclNode] = {}
+
+    def resolve(self, program: ProgramNode) -> dict[int, DeclNode]:
+        program.accept(self)
+        return self.bindings
+
+    def visit_struct_declaration(self, node):
+        self.scopes.append({field.variable: None for field in node.fields})
+        super().visit_struct_declaration(node)
+        self.scopes.pop()
+
+    def visit_function_declaration(self, node):
+        self.scopes.append({param.name: None for param in node.params})
+        super().visit_function_declaration(node)
+        self.scopes.pop()
+
+    def visit_code_block(self, node):
+        self.scopes.append({})
+        super().visit_code_block(node)
+        self.scopes.pop()
+
+    def visit_declaration(self, node):
+        super().visit_declaration(node)
+        self.scopes[-1][node.variable] = node
+
+    def visit_assignment(self, node):
+        self.__bind(node, node.variable)
+        super().visit_assignment(node)
+
+    def visit_id(self, node):
+        self.__bind(node, node.value)
+
+    def visit_struct_field(self, node):
+        self.__bind(node, node.field_chain.fields[0])
+
+    def visit_struct_field_assignment(self, node):
+        self.__bind(node, node.target.field_chain.fields[0])
+        node.expr_node.accept(self)
+
+    def visit_function_call(self, node):
+        if node.field_chain:
+            self.__bind(node, node.field_chain.fields[0])
+        super().visit_function_call(node)
+
+    def __bind(self, node, name: str):
+        for scope in reversed(self.scopes):
+            if name in scope:
+                if scope[name]:
+                    self.bindings[id(node)] = scope[name]
+                return
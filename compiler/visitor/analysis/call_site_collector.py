@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+from ..ast_walker import ASTWalker
+
+
+class CallSiteCollector(ASTWalker):
+    def __init__(self, function_names: set[str], member_names: dict[str, set[str]]):
+        self.function_names = function_names
+        self.member_names = member_names
+        self.current_struct = None
+        self.call_sites = []
+
+    def collect(self, node) -> list:
+        node.accept(self)
+        return self.call_sites
+
+    def visit_struct_declaration(self, node):
+        self.current_struct = node.variable
+        super().visit_struct_declaration(node)
+        self.current_struct = None
+
+    def visit_function_call(self, node):
+        if self.__calls_global_function(node):
+            self.call_sites.append(node)
+        super().visit_function_call(node)
+
+    def __calls_global_function(self, node) -> bool:
+        if node.field_chain or node.value not in self.function_names:
+            return False
+        return not self.current_struct or node.value not in self.member_names.get(self.current_struct, set())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+from typing import Optional, Union
+from ..ast_walker import ASTWalker
+from ...helpers.struct_field import StructField
+from ...llvm_specifics.data_type import DataType
+from ...llvm_specifics.memory_effect import MemoryEffect
+from ...node.id_node import IDNode
+from ...node.struct_field_node import StructFieldNode
+
+LOCAL = "local"
+PARAM = "param"
+THIS = "this"
+RECEIVER_INDEX = -1
+
+
+class EffectCollector(ASTWalker):
+    def __init__(self, node, struct_name: Optional[str], struct_definitions: dict[str, list[StructField]],
+                 member_names: dict[str, set[str]]):
+        self.node = node
+        self.struct_name = struct_name
+        self.struct_definitions = struct_definitions
+        self.member_names = member_names
+        self.params = {param.name: self.__resolve_type(param.param_type) for param in node.params}
+        self.fields = ({field.variable: self.__resolve_type(field.data_type)
+                        for field in struct_definitions[struct_name]} if struct_name else {})
+        self.scopes: list[dict[str, Union[DataType, str]]] = []
+        self.effect = MemoryEffect.READ_NONE
+        self.returns_struct = not DataType.is_data_type(node.return_type)
+        self.calls: list[tuple[str, bool]] = []
+        self.struct_arguments: dict[str, set[tuple[str, int]]] = {}
+        self.address_taken: set[str] = set()
+
+    def collect(self) -> 'EffectCollector':
+        self.node.body.accept(self)
+        return self
+
+    def visit_code_block(self, node):
+        self.scopes.append({})
+        super().visit_code_block(node)
+        self.scopes.pop()
+
+    def visit_declaration(self, node):
+        super().visit_declaration(node)
+        self.scopes[-1][node.variable] = node.data_type
+
+    def visit_id(self, node):
+        self.__note_reference(node.value)
+        if isinstance(self.__lookup_type(node.value), str):
+            self.address_taken.add(node.value)
+
+    def visit_assignment(self, node):
+        if self.__origin(node.variable) == THIS:
+            self.__raise_effect(MemoryEffect.WRITES)
+        super().visit_assignment(node)
+
+    def visit_struct_field(self, node):
+        if self.__origin(node.field_chain.fields[0]) != LOCAL:
+            self.__raise_effect(MemoryEffect.READ_ONLY)
+        if isinstance(self.__resolve_chain_type(node.field_chain.fields), str):
+            self.address_taken.add(node.field_chain.fields[0])
+
+    def visit_struct_field_assignment(self, node):
+        if self.__origin(node.target.field_chain.fields[0]) != LOCAL:
+            self.__raise_effect(MemoryEffect.WRITES)
+        node.expr_node.accept(self)
+
+    def visit_function_call(self, node):
+        passes_external = any(self.__is_external_pointer(arg) for arg in node.arguments)
+
+        if node.field_chain:
+            receiver_type = self.__resolve_chain_type(node.field_chain.fields)
+            callee = f"{receiver_type}_{node.value}"
+            self.calls.append((callee, passes_external or self.__origin(node.field_chain.fields[0]) != LOCAL))
+            self.struct_arguments.setdefault(node.field_chain.fields[0], set()).add((callee, RECEIVER_INDEX))
+            self.address_taken.add(node.field_chain.fields[0])
+        elif self.struct_name and node.value in self.member_names.get(self.struct_name, set()):
+            callee = f"{self.struct_name}_{node.value}"
+            self.calls.append((callee, True))
+        else:
+            callee = node.value
+            self.calls.append((callee, passes_external))
+
+        for index, arg in enumerate(node.arguments):
+            if isinstance(arg, IDNode) and isinstance(self.__lookup_type(arg.value), str):
+                self.__note_reference(arg.value)
+                self.struct_arguments.setdefault(arg.value, set()).add((callee, index))
+            else:
+                arg.accept(self)
+
+    def __note_reference(self, name: str):
+        if self.__origin(name) == THIS:
+            self.__raise_effect(MemoryEffect.READ_ONLY)
+
+    def __raise_effect(self, effect: MemoryEffect):
+        self.effect = self.effect.join(effect)
+
+    def __origin(self, name: str) -> Optional[str]:
+        if any(name in scope for scope in self.scopes):
+            return LOCAL
+        if name in self.params:
+            return PARAM
+        if name in self.fields:
+            return THIS
+        return None
+
+    def __lookup_type(self, name: str) -> Optional[Union[DataType, str]]:
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return self.params.get(name, self.fields.get(name))
+
+    def __is_external_pointer(self, arg) -> bool:
+        if isinstance(arg, IDNode):
+            return self.__origin(arg.value) in (PARAM, THIS) and isinstance(self.__lookup_type(arg.value), str)
+        if isinstance(arg, StructFieldNode):
+            return (self.__origin(arg.field_chain.fields[0]) in (PARAM, THIS) and
+                    isinstance(self.__resolve_chain_type(arg.field_chain.fields), str))
+        return False
+
+    def __resolve_chain_type(self, chain: list[str]) -> Optional[Union[DataType, str]]:
+        current_type = self.__lookup_type(chain[0])
+        for field_name in chain[1:]:
+            if not isinstance(current_type, str):
+                return current_type
+            field = next((f for f in self.struct_definitions.get(current_type, []) if f.variable == field_name), None)
+            current_type = self.__resolve_type(field.data_type) if field else None
+        return current_type
+
+    @staticmethod
+    def __resolve_type(type_str: str) -> Union[DataType, str]:
+        return DataType.from_string(type_str) if DataType.is_data_type(type_str) else type_str
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+from ..ast_walker import ASTWalker
+from ..optimizer.constant_folder import ConstantFolder
+from ...node.if_node import IfNode
+
+SELECT_COST_LIMIT = 6
+
+
+class IfConversionAnalyzer(ASTWalker):
+    def __init__(self):
+        self.scopes: list[set[str]] = []
+        self.assigned_variables: list[str] = []
+        self.is_speculatable = True
+        self.cost = 0
+        self.has_literal_condition = False
+
+    def analyze(self, node: IfNode) -> 'IfConversionAnalyzer':
+        self.has_literal_condition = ConstantFolder.is_literal(node.condition)
+        node.then_block.accept(self)
+        if node.else_block:
+            node.else_block.accept(self)
+        return self
+
+    def can_lower_to_select(self) -> bool:
+        return self.is_speculatable and not self.has_literal_condition and self.cost <= SELECT_COST_LIMIT
+
+    def visit_code_block(self, node):
+        self.scopes.append(set())
+        super().visit_code_block(node)
+        self.scopes.pop()
+
+    def visit_declaration(self, node):
+        self.is_speculatable = False
+        self.scopes[-1].add(node.variable)
+        super().visit_declaration(node)
+
+    def visit_assignment(self, node):
+        self.cost += 1
+        is_local = any(node.variable in scope for scope in self.scopes)
+        if not is_local and node.variable not in self.assigned_variables:
+            self.assigned_variables.append(node.variable)
+        super().visit_assignment(node)
+
+    def visit_return(self, node):
+        self.is_speculatable = False
+        super().visit_return(node)
+
+    def visit_if_statement(self, node):
+        self.is_speculatable = False
+        super().visit_if_statement(node)
+
+    def visit_binary_operation(self, node):
+        self.cost += 1
+        super().visit_binary_operation(node)
+
+    def visit_unary_operation(self, node):
+        self.cost += 1
+        super().visit_unary_operation(node)
+
+    def visit_struct_field(self, node):
+        self.cost += len(node.field_chain.fields)
+
+    def visit_struct_initialization(self, node):
+        self.is_speculatable = False
+        super().visit_struct_initialization(node)
+
+    def visit_struct_field_assignment(self, node):
+        self.is_speculatable = False
+        super().visit_struct_field_assignment(node)
+
+    def visit_function_call(self, node):
+        self.is_speculatable = False
+        super().visit_function_call(node)
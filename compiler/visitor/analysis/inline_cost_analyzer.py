@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+from ..ast_walker import ASTWalker
+
+CALL_COST = 5
+BRANCH_COST = 10
+
+
+class InlineCostAnalyzer(ASTWalker):
+    def __init__(self, func_name: str):
+        self.func_name = func_name
+        self.size = 0
+        self.has_branches = False
+        self.is_recursive = False
+
+    def analyze(self, node) -> 'InlineCostAnalyzer':
+        node.body.accept(self)
+        return self
+
+    def visit_declaration(self, node):
+        self.size += 1
+        super().visit_declaration(node)
+
+    def visit_assignment(self, node):
+        self.size += 1
+        super().visit_assignment(node)
+
+    def visit_binary_operation(self, node):
+        self.size += 1
+        super().visit_binary_operation(node)
+
+    def visit_unary_operation(self, node):
+        self.size += 1
+        super().visit_unary_operation(node)
+
+    def visit_if_statement(self, node):
+        self.size += BRANCH_COST
+        self.has_branches = True
+        super().visit_if_statement(node)
+
+    def visit_struct_initialization(self, node):
+        self.size += 1 + 2 * len(node.init_expressions)
+        super().visit_struct_initialization(node)
+
+    def visit_struct_field(self, node):
+        self.size += len(node.field_chain.fields)
+
+    def visit_struct_field_assignment(self, node):
+        self.size += len(node.target.field_chain.fields)
+        node.expr_node.accept(self)
+
+    def visit_function_call(self, node):
+        self.size += CALL_COST
+        if node.value == self.func_name and not node.field_chain:
+            self.is_recursive = True
+        super().visit_function_call(node)
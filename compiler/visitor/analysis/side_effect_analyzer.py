@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+from .effect_collector import EffectCollector
+from ...llvm_specifics.memory_effect import MemoryEffect
+from ...node.program_node import ProgramNode
+
+
+class SideEffectAnalyzer:
+    def __init__(self):
+        self.effects: dict[str, MemoryEffect] = {}
+        self.call_graph: dict[str, set[str]] = {}
+        self.struct_returning: set[str] = set()
+        self.struct_arguments: dict[str, dict[str, set[tuple[str, int]]]] = {}
+        self.address_taken: dict[str, set[str]] = {}
+
+    def analyze(self, program: ProgramNode) -> 'SideEffectAnalyzer':
+        collectors = self.__collect_local_effects(program)
+        self.call_graph = {name: {callee for callee, _ in collector.calls} for name, collector in collectors.items()}
+        self.effects = {name: collector.effect for name, collector in collectors.items()}
+        self.struct_returning = {name for name, collector in collectors.items() if collector.returns_struct}
+        self.struct_arguments = {name: collector.struct_arguments for name, collector in collectors.items()}
+        self.address_taken = {name: collector.address_taken for name, collector in collectors.items()}
+        self.__propagate_effects(collectors)
+        return self
+
+    def get_effect(self, func_name: str) -> MemoryEffect:
+        effect = self.get_argument_effect(func_name)
+        return effect.join(MemoryEffect.WRITES) if func_name in self.struct_returning else effect
+
+    def get_argument_effect(self, func_name: str) -> MemoryEffect:
+        return self.effects.get(func_name, MemoryEffect.WRITES)
+
+    def is_recursive(self, func_name: str) -> bool:
+        return func_name in self.reachable_from(func_name)
+
+    def reachable_from(self, func_name: str) -> set[str]:
+        visited = set()
+        pending = list(self.call_graph.get(func_name, set()))
+
+        while pending:
+            callee = pending.pop()
+            if callee not in visited:
+                visited.add(callee)
+                pending.extend(self.call_graph.get(callee, set()))
+        return visited
+
+    @staticmethod
+    def __collect_local_effects(program: ProgramNode) -> dict[str, EffectCollector]:
+        struct_definitions = {struct_decl.variable: struct_decl.fields for struct_decl in program.struct_decls}
+        member_names = {struct_decl.variable: {member.variable for member in struct_decl.member_functions}
+                        for struct_decl in program.struct_decls}
+
+        collectors = {func_decl.variable: EffectCollector(func_decl, None, struct_definitions, member_names).collect()
+                      for func_decl in program.func_decls}
+        for struct_decl in program.struct_decls:
+            for member_func in struct_decl.member_functions:
+                collectors[f"{struct_decl.variable}_{member_func.variable}"] = EffectCollector(
+                    member_func, struct_decl.variable, struct_definitions, member_names).collect()
+        return collectors
+
+    def __propagate_effects(self, collectors: dict[str, EffectCollector]):
+        changed = True
+        while changed:
+            changed = False
+            for name, collector in collectors.items():
+                effect = self.effects[name]
+                for callee, passes_external in collector.calls:
+                    if passes_external:
+                        effect = effect.join(self.get_argument_effect(callee))
+
+                if effect != self.effects[name]:
+                    self.effects[name] = effect
+                    changed = True
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+from typing import Optional
+from ..ast_walker import ASTWalker
+from ...helpers.struct_field import StructField
+from ...llvm_specifics.data_type import DataType
+from ...node.decl_node import DeclNode
+from ...node.id_node import IDNode
+from ...node.program_node import ProgramNode
+from ...node.struct_field_node import StructFieldNode
+from ...node.struct_init_node import StructInitNode
+
+
+class StructEscapeAnalyzer(ASTWalker):
+    def __init__(self, struct_definitions: Optional[dict[str, list[StructField]]] = None):
+        self.struct_definitions: dict[str, list[StructField]] = dict(struct_definitions or {})
+        self.scopes: list[dict[str, Optional[DeclNode]]] = []
+        self.declaration_depths: dict[DeclNode, int] = {}
+        self.escaped: set[DeclNode] = set()
+        self.struct_declarations: set[DeclNode] = set()
+        self.written: set[DeclNode] = set()
+        self.read_only: set[DeclNode] = set()
+
+    def analyze(self, program: ProgramNode) -> set[DeclNode]:
+        self.struct_definitions.update({struct_decl.variable: struct_decl.fields for struct_decl in program.struct_decls})
+        functions = program.func_decls + [member_func for struct_decl in program.struct_decls
+                                          for member_func in struct_decl.member_functions]
+        for func_decl in functions:
+            self.scopes = [{param.name: None for param in func_decl.params}]
+            func_decl.body.accept(self)
+
+        self.scopes = [{}]
+        [stmt.accept(self) for stmt in program.statement_nodes]
+        if program.return_node:
+            program.return_node.accept(self)
+        self.read_only = self.struct_declarations - self.written
+        return set(self.declaration_depths) - self.escaped
+
+    def visit_code_block(self, node):
+        self.scopes.append({})
+        super().visit_code_block(node)
+        self.scopes.pop()
+
+    def visit_declaration(self, node):
+        super().visit_declaration(node)
+        is_struct = isinstance(node.data_type, str)
+        self.scopes[-1][node.variable] = node if is_struct else None
+        if is_struct:
+            self.struct_declarations.add(node)
+        if isinstance(node.expr_node, StructInitNode) and self.__has_only_primitive_fields(node.data_type):
+            self.declaration_depths[node] = len(self.scopes)
+
+    def visit_id(self, node):
+        self.__escape(node.value)
+
+    def visit_struct_field(self, node):
+        if len(node.field_chain.fields) != 2:
+            self.__escape(node.field_chain.fields[0])
+
+    def visit_struct_field_assignment(self, node):
+        declaration = self.__lookup(node.target.field_chain.fields[0])
+        if declaration:
+            self.written.add(declaration)
+        if declaration and (len(node.target.field_chain.fields) != 2 or
+                            self.declaration_depths.get(declaration) != len(self.scopes)):
+            self.escaped.add(declaration)
+        node.expr_node.accept(self)
+
+    def visit_function_call(self, node):
+        if node.field_chain:
+            self.__escape(node.field_chain.fields[0])
+            self.__mark_written(node.field_chain.fields[0])
+        for arg in node.arguments:
+            if isinstance(arg, IDNode) or (isinstance(arg, StructFieldNode) and self.__is_struct_chain(arg)):
+                self.__mark_written(arg.field_chain.fields[0] if isinstance(arg, StructFieldNode) else arg.value)
+        super().visit_function_call(node)
+
+    def __mark_written(self, name: str):
+        declaration = self.__lookup(name)
+        if declaration:
+            self.written.add(declaration)
+
+    def __is_struct_chain(self, node: StructFieldNode) -> bool:
+        declaration = self.__lookup(node.field_chain.fields[0])
+        current_type = declaration.data_type if declaration else None
+        for field_name in node.field_chain.fields[1:]:
+            field = next((f for f in self.struct_definitions.get(current_type, []) if f.variable == field_name), None)
+            current_type = field.data_type if field else None
+        return current_type in self.struct_definitions
+
+    def __escape(self, name: str):
+        declaration = self.__lookup(name)
+        if declaration:
+            self.escaped.add(declaration)
+
+    def __lookup(self, name: str) -> Optional[DeclNode]:
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+    def __has_only_primitive_fields(self, type_name) -> bool:
+        fields = self.struct_definitions.get(type_name) if isinstance(type_name, str) else None
+        return bool(fields) and all(DataType.is_data_type(field.data_type) for field in fields)
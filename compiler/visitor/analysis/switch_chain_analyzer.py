@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+from typing import Optional, Union
+from ...constants import I32_MAX, I32_MIN, I64_MAX, I64_MIN
+from ...llvm_specifics.data_type import DataType
+from ...llvm_specifics.operator import Operator
+from ...node.binary_op_node import BinaryOpNode
+from ...node.code_block_node import CodeBlockNode
+from ...node.id_node import IDNode
+from ...node.if_node import IfNode
+from ...node.number_node import NumberNode
+
+MIN_SWITCH_CASES = 3
+CASE_RANGES = {DataType.I32: (I32_MIN, I32_MAX), DataType.I64: (I64_MIN, I64_MAX)}
+
+
+class SwitchChainAnalyzer:
+    def __init__(self):
+        self.subject: Optional[IDNode] = None
+        self.cases: list[tuple[str, CodeBlockNode]] = []
+        self.default_block: Optional[CodeBlockNode] = None
+
+    def analyze(self, node: IfNode) -> 'SwitchChainAnalyzer':
+        self.subject = self.__match_subject(node.condition)
+        seen_literals = set()
+        current = node if self.subject else None
+        while current:
+            literal = self.__match_literal(current.condition)
+            if int(literal) not in seen_literals:
+                seen_literals.add(int(literal))
+                self.cases.append((literal, current.then_block))
+            nested = self.__get_chained_if(current.else_block)
+            if nested is None:
+                self.default_block = current.else_block
+            current = nested
+        return self
+
+    def can_lower_to_switch(self, subject_type: Union[DataType, str]) -> bool:
+        if len(self.cases) < MIN_SWITCH_CASES or subject_type not in CASE_RANGES:
+            return False
+        low, high = CASE_RANGES[subject_type]
+        return all(low <= int(literal) <= high for literal, _ in self.cases)
+
+    def __get_chained_if(self, block: Optional[CodeBlockNode]) -> Optional[IfNode]:
+        if block is None or block.return_node or len(block.statements) != 1:
+            return None
+        nested = block.statements[0]
+        return nested if isinstance(nested, IfNode) and self.__match_literal(nested.condition) else None
+
+    def __match_literal(self, condition) -> Optional[str]:
+        if not self.subject or not isinstance(condition, BinaryOpNode) or condition.operator != Operator.EQUALS:
+            return None
+        for candidate, literal in ((condition.left, condition.right), (condition.right, condition.left)):
+            if (isinstance(candidate, IDNode) and candidate.value == self.subject.value
+                    and isinstance(literal, NumberNode)):
+                return literal.value
+        return None
+
+    @staticmethod
+    def __match_subject(condition) -> Optional[IDNode]:
+        if not isinstance(condition, BinaryOpNode) or condition.operator != Operator.EQUALS:
+            return None
+        operands = (condition.left, condition.right)
+        ids = [operand for operand in operands if isinstance(operand, IDNode)]
+        has_literal = any(isinstance(operand, NumberNode) for operand in operands)
+        return ids[0] if ids and has_literal else None
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+from ..ast_walker import ASTWalker
+from ...node.function_call_node import FunctionCallNode
+
+
+class TailCallAnalyzer(ASTWalker):
+    def __init__(self, func_name: str):
+        self.func_name = func_name
+        self.has_self_tail_call = False
+        self.allocates_structs = False
+
+    def analyze(self, node) -> 'TailCallAnalyzer':
+        node.body.accept(self)
+        return self
+
+    def can_lower_to_loop(self) -> bool:
+        return self.has_self_tail_call and not self.allocates_structs
+
+    def visit_return(self, node):
+        if self.is_self_call(node.expr_node, self.func_name):
+            self.has_self_tail_call = True
+        super().visit_return(node)
+
+    def visit_declaration(self, node):
+        if isinstance(node.data_type, str):
+            self.allocates_structs = True
+        super().visit_declaration(node)
+
+    def visit_struct_initialization(self, node):
+        self.allocates_structs = True
+        super().visit_struct_initialization(node)
+
+    @staticmethod
+    def is_self_call(expr_node, func_name: str) -> bool:
+        return (isinstance(expr_node, FunctionCallNode) and not expr_node.field_chain
+                and expr_node.value == func_name)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+from .ast_visitor import ASTVisitor
+
+
+class ASTWalker(ASTVisitor):
+    def visit_program(self, node):
+        [decl.accept(self) for decl in node.struct_decls + node.func_decls + node.statement_nodes]
+        if node.return_node:
+            node.return_node.accept(self)
+
+    def visit_declaration(self, node):
+        node.expr_node.accept(self)
+
+    def visit_assignment(self, node):
+        node.expr_node.accept(self)
+
+    def visit_return(self, node):
+        node.expr_node.accept(self)
+
+    def visit_binary_operation(self, node):
+        node.left.accept(self)
+        node.right.accept(self)
+
+    def visit_id(self, node):
+        pass
+
+    def visit_number(self, node):
+        pass
+
+    def visit_boolean(self, node):
+        pass
+
+    def visit_if_statement(self, node):
+        node.condition.accept(self)
+        node.then_block.accept(self)
+        if node.else_block:
+            node.else_block.accept(self)
+
+    def visit_code_block(self, node):
+        [n.accept(self) for n in node.statements]
+        if node.return_node:
+            node.return_node.accept(self)
+
+    def visit_unary_operation(self, node):
+        node.operand.accept(self)
+
+    def visit_struct_declaration(self, node):
+        [member_func.accept(self) for member_func in node.member_functions]
+
+    def visit_struct_initialization(self, node):
+        [expr.accept(self) for expr in node.init_expressions]
+
+    def visit_struct_field_assignment(self, node):
+        node.target.accept(self)
+        node.expr_node.accept(self)
+
+    def visit_struct_field(self, node):
+        pass
+
+    def visit_function_declaration(self, node):
+        node.body.accept(self)
+
+    def visit_function_call(self, node):
+        [arg.accept(self) for arg in node.arguments]
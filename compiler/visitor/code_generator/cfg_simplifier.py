@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+from .ir_model import BasicBlock, Function, Instruction
+
+CONSTANT_CONDITIONS = {"1": 0, "true": 0, "0": 1, "false": 1}
+
+
+class CfgSimplifier:
+    def simplify(self, function: Function):
+        changed = True
+        while changed:
+            changed = (self.__fold_branches(function) | self.__remove_unreachable(function) |
+                       self.__fold_trivial_phis(function) | self.__thread_empty_blocks(function) |
+                       self.__merge_straight_line(function))
+
+    @staticmethod
+    def __fold_branches(function: Function) -> bool:
+        changed = False
+        for block in function.blocks:
+            branch = block.terminator()
+            if branch.opcode != "br" or len(branch.labels) != 2:
+                continue
+            condition, (then_label, else_label) = branch.operands[0], branch.labels
+            if condition in CONSTANT_CONDITIONS or then_label == else_label:
+                target = (then_label, else_label)[CONSTANT_CONDITIONS.get(condition, 0)]
+                function.replace_instruction(block, branch, Instruction.branch(target))
+                changed = True
+        return changed
+
+    def __remove_unreachable(self, function: Function) -> bool:
+        by_label = function.block_by_label()
+        reachable, worklist = {id(function.blocks[0])}, [function.blocks[0]]
+        while worklist:
+            for successor in worklist.pop().successors():
+                block = by_label.get(successor)
+                if block and id(block) not in reachable:
+                    reachable.add(id(block))
+                    worklist.append(block)
+
+        changed = False
+        for block in [block for block in function.blocks if id(block) not in reachable]:
+            for instruction in list(block.instructions):
+                function.erase(block, instruction)
+            function.blocks.remove(block)
+            changed = True
+        return self.__prune_phi_incoming(function) or changed
+
+    @staticmethod
+    def __prune_phi_incoming(function: Function) -> bool:
+        predecessors = function.predecessors()
+        changed = False
+        for block in filter(BasicBlock.has_phis, function.blocks):
+            for phi in block.phis():
+                incoming = [(value, label) for value, label in phi.incoming()
+                            if label in predecessors.get(block.label, [])]
+                if len(incoming) == len(phi.incoming()):
+                    continue
+                function.replace_instruction(block, phi, Instruction.phi(phi.type, incoming).named(phi.result))
+                changed = True
+        return changed
+
+    @staticmethod
+    def __fold_trivial_phis(function: Function) -> bool:
+        for block in filter(BasicBlock.has_phis, function.blocks):
+            for phi in block.phis():
+                values = set(phi.operands)
+                if len(values) != 1:
+                    continue
+                function.erase(block, phi)
+                function.replace_all_uses(phi.result, values.pop())
+                return True
+        return False
+
+    @staticmethod
+    def __thread_empty_blocks(function: Function) -> bool:
+        by_label = function.block_by_label()
+        for block in function.blocks[1:]:
+            target = by_label.get(block.successors()[0]) if block.is_empty_jump() else None
+            if target is None or target is block or target.has_phis():
+                continue
+            for other in function.blocks:
+                other.terminator().replace_label(block.label, target.label)
+            return True
+        return False
+
+    @staticmethod
+    def __merge_straight_line(function: Function) -> bool:
+        by_label = function.block_by_label()
+        predecessors = function.predecessors()
+        for block in function.blocks:
+            if not block.terminator().is_unconditional_branch():
+                continue
+            successor = by_label.get(block.successors()[0])
+            if (successor is None or successor is function.blocks[0] or successor is block or successor.has_phis()
+                    or predecessors.get(successor.label) != [block.label]):
+                continue
+            if block.label is None and any(by_label[label].has_phis() for label in successor.successors()):
+                continue
+            function.erase(block, block.terminator())
+            block.instructions.extend(successor.instructions)
+            function.blocks.remove(successor)
+            for label in successor.successors():
+                for phi in by_label[label].phis():
+                    phi.replace_label(successor.label, block.label)
+            return True
+        return False
@@ -1,44 +1,120 @@
 #!/usr/bin/env python3
+from typing import Optional, TextIO
 from ...llvm_specifics.boolean import Boolean
 from ...llvm_specifics.data_type import DataType
 from ..ast_visitor import ASTVisitor
 from ...node.code_block_node import CodeBlockNode
+from ...node.decl_node import DeclNode
 from ...node.if_node import IfNode
+from ...node.function_call_node import FunctionCallNode
+from ...node.program_node import ProgramNode
 from ...constants import NOT
 from .variable_registry import VariableRegistry
 from .llvm_emitter import LLVMEmitter
+from .ir_model import Instruction
+from .cfg_simplifier import CfgSimplifier
+from .codegen_options import CodegenOptions
+from .peephole_optimizer import PeepholeOptimizer
 from .type_converter import TypeConverter
 from .struct_operations import StructOperations
 from .function_generator import FunctionGenerator
+from .function_inliner import FunctionInliner
+from .function_memoizer import FunctionMemoizer
+from .function_attributes import FunctionAttributes
+from .struct_abi import StructAbi
+from .stack_slot_allocator import StackSlotAllocator
+from ..analysis.if_conversion_analyzer import IfConversionAnalyzer
+from ..analysis.side_effect_analyzer import SideEffectAnalyzer
+from ..analysis.switch_chain_analyzer import SwitchChainAnalyzer
+from ..analysis.struct_escape_analyzer import StructEscapeAnalyzer
 
 
 class CodeGenerator(ASTVisitor):
-    def __init__(self):
+    def __init__(self, options: Optional[CodegenOptions] = None, output: Optional[TextIO] = None):
+        self.options = options if options is not None else CodegenOptions()
         self.variable_registry = VariableRegistry()
-        self.emitter = LLVMEmitter()
+        self.emitter = LLVMEmitter(PeepholeOptimizer() if self.options.peephole else None,
+                                   CfgSimplifier() if self.options.cfg_simplification else None,
+                                   self.options.value_numbering, output)
         self.type_converter = None
         self.struct_ops = None
+        self.stack_slots = None
+        self.inliner = None
+        self.memoizer = None
+        self.attributes = None
+        self.struct_abi = None
         self.func_gen = None
+        self.no_signed_wrap = self.options.no_signed_wrap
+        self.struct_fields = {}
+        self.scalar_struct_decls = set()
+        self.read_only_struct_decls = set()
         self._initialize_helpers()
 
     def _initialize_helpers(self):
         self.type_converter = TypeConverter(self.variable_registry, None, {})
-        self.struct_ops = StructOperations(self.emitter, self.variable_registry, self.type_converter)
-        self.func_gen = FunctionGenerator(self.emitter, self.variable_registry,
-                                          self.type_converter, self.struct_ops)
+        self.struct_ops = StructOperations(self.emitter, self.variable_registry, self.type_converter,
+                                           self.options.constant_globals)
+        self.stack_slots = StackSlotAllocator(self.emitter, self.struct_ops, self.options.slot_sharing)
+        self.inliner = FunctionInliner(self.emitter, self.variable_registry, self.type_converter,
+                                       self.struct_ops, self.options.inline_threshold)
+        self.memoizer = FunctionMemoizer(self.emitter, self.options.memoize)
+        self.attributes = FunctionAttributes()
+        self.struct_abi = StructAbi(self.struct_ops, self.inliner, self.options.struct_abi)
+        self.func_gen = FunctionGenerator(self.emitter, self.variable_registry, self.type_converter, self.struct_ops,
+                                          self.stack_slots, self.inliner, self.memoizer, self.attributes,
+                                          self.struct_abi)
         self.type_converter.struct_ops = self.struct_ops
         self.type_converter.function_return_types = self.func_gen.function_return_types
 
     def visit_program(self, node):
+        return self.generate_program(node, SideEffectAnalyzer().analyze(node))
+
+    def generate_program(self, node, side_effects: SideEffectAnalyzer) -> Optional[str]:
+        self.__begin_program(node, side_effects)
+        self.inliner.register_functions(node)
+        self.__analyze_struct_escapes(node)
+        [decl.accept(self) for decl in node.struct_decls + node.func_decls]
+        return self.__generate_main(node)
+
+    def begin_streaming(self, signatures: ProgramNode):
+        self.__begin_program(signatures, SideEffectAnalyzer())
+        self.inliner.register_functions(signatures)
+        [decl.accept(self) for decl in signatures.struct_decls]
+
+    def generate_fragment(self, fragment: ProgramNode) -> Optional[str]:
+        self.__analyze_struct_escapes(fragment)
+        [decl.accept(self) for decl in fragment.func_decls]
+        return self.__generate_main(fragment) if fragment.return_node else None
+
+    def __begin_program(self, node, side_effects: SideEffectAnalyzer):
         self._reset_state()
-        [decl.accept(self) for decl in node.struct_decls + node.func_decls + node.statement_nodes]
-        node.return_node.accept(self)
+        self.struct_fields = {struct_decl.variable: struct_decl.fields for struct_decl in node.struct_decls}
+        self.func_gen.register_function_signatures(node)
+        self.memoizer.select_functions(node, side_effects)
+        self.attributes.configure(side_effects, self.memoizer.memoized_functions)
+        self.struct_abi.configure(side_effects)
+
+    def __analyze_struct_escapes(self, node):
+        escape_analyzer = StructEscapeAnalyzer(self.struct_fields)
+        scalar_struct_decls = escape_analyzer.analyze(node)
+        self.scalar_struct_decls = scalar_struct_decls if self.options.scalar_replacement else set()
+        self.read_only_struct_decls = escape_analyzer.read_only
+
+    def __generate_main(self, node) -> str:
+        [self.__visit_statement(stmt) for stmt in node.statement_nodes + [node.return_node]]
         return self.emitter.build_final_output()
 
+    def __visit_statement(self, node):
+        mark = self.stack_slots.begin_statement()
+        node.accept(self)
+        self.stack_slots.end_statement(mark)
+
     def _reset_state(self):
-        self.emitter.translated_lines = []
-        self.emitter.struct_type_lines = []
-        self.emitter.function_definitions = []
+        self.emitter.reset_body()
+        self.emitter.value_numbering.clear()
+        self.stack_slots.reset()
+        self.emitter.reset_module()
+        self.struct_ops.constant_globals = {}
 
     def visit_struct_declaration(self, node):
         fields = self.struct_ops.build_struct_fields(node)
@@ -47,11 +123,15 @@ class CodeGenerator(ASTVisitor):
          for member_func in node.member_functions]
 
     def visit_struct_initialization(self, node):
-        struct_reg = self.struct_ops.allocate_struct(node.struct_type)
+        struct_reg = self.stack_slots.allocate_temporary(node.struct_type)
         self.struct_ops.initialize_struct_fields(node, struct_reg, self)
         return struct_reg
 
     def visit_struct_field(self, node):
+        scalar_fields = self.variable_registry.get_scalar_fields(node.field_chain.fields[0])
+        if scalar_fields and len(node.field_chain.fields) == 2:
+            return scalar_fields[node.field_chain.fields[1]]
+
         current_reg = self.variable_registry.get_current_register(node.field_chain.fields[0])
         current_type = self.variable_registry.get_variable_type(node.field_chain.fields[0])
 
@@ -66,6 +146,10 @@ class CodeGenerator(ASTVisitor):
 
     def visit_struct_field_assignment(self, node):
         base_field = node.target.field_chain.fields[0]
+        if self.variable_registry.get_scalar_fields(base_field):
+            self.__assign_scalar_field(node)
+            return
+
         current_reg = self.variable_registry.get_current_register(base_field)
         current_type = self.variable_registry.get_variable_type(base_field)
 
@@ -76,6 +160,17 @@ class CodeGenerator(ASTVisitor):
             current_reg, current_type = self.__prepare_field_assignment(
                 current_reg, current_type, field_name, node, is_final)
 
+    def __assign_scalar_field(self, node):
+        variable, field_name = node.target.field_chain.fields
+        struct_name = self.variable_registry.get_variable_type(variable)
+        _, _, field_data_type = self.struct_ops.find_field(self.struct_ops.struct_definitions[struct_name], field_name)
+
+        expr_value = node.expr_node.accept(self)
+        expr_type = self.type_converter.get_node_type(node.expr_node)
+        scalar_fields = dict(self.variable_registry.get_scalar_fields(variable))
+        scalar_fields[field_name] = self.struct_ops.convert_type_if_needed(expr_value, expr_type, field_data_type)
+        self.variable_registry.set_scalar_fields(variable, scalar_fields)
+
     def __prepare_field_assignment(self, current_reg, current_type, field_name, node, is_final):
         if not isinstance(current_type, str):
             return current_reg, current_type
@@ -100,7 +195,7 @@ class CodeGenerator(ASTVisitor):
         expr_type = self.type_converter.get_node_type(node.expr_node)
 
         expr_value = self.struct_ops.convert_type_if_needed(expr_value, expr_type, field_data_type)
-        self.emitter.emit_line(f"  store {field_llvm_type} {expr_value}, {field_llvm_type}* {field_ptr}")
+        self.emitter.emit(Instruction.store(field_llvm_type, expr_value, field_ptr))
 
     def visit_function_declaration(self, node):
         self.func_gen.generate_standalone_function(node, self)
@@ -114,12 +209,35 @@ class CodeGenerator(ASTVisitor):
          if isinstance(node.data_type, str) else self.__declare_primitive_variable(node)
 
     def __declare_struct_variable(self, node):
-        struct_value = node.expr_node.accept(self)
-        reg = self.variable_registry.get_variable_register(node.variable)
+        if node in self.scalar_struct_decls:
+            self.__declare_scalar_struct(node)
+            return
+
+        reg, version = self.variable_registry.reserve_register(node.variable)
+        constant_global = (self.struct_ops.get_constant_global(node.expr_node, self)
+                           if node in self.read_only_struct_decls else None)
+        if constant_global:
+            self.emitter.emit(Instruction.element_pointer(
+                f"%struct.{node.data_type}", constant_global, [("i32", "0")]).named(reg))
+        else:
+            self.stack_slots.allocate_variable(reg, node.data_type)
+            self.func_gen.construct_struct_into(reg, node.data_type, node.expr_node, self)
+
+        self.variable_registry.set_variable_version(node.variable, version)
         self.variable_registry.set_variable_type(node.variable, node.data_type)
 
-        self.emitter.emit_line(f"  {reg} = alloca %struct.{node.data_type}")
-        self.struct_ops.copy_struct_fields(node.data_type, struct_value, reg)
+    def __declare_scalar_struct(self, node):
+        _, version = self.variable_registry.reserve_register(node.variable)
+        scalar_fields = {}
+        for (field_name, _, field_data_type), expr in zip(self.struct_ops.struct_definitions[node.data_type],
+                                                          node.expr_node.init_expressions):
+            value = expr.accept(self)
+            scalar_fields[field_name] = self.struct_ops.convert_type_if_needed(
+                value, self.type_converter.get_node_type(expr), field_data_type)
+
+        self.variable_registry.set_variable_version(node.variable, version)
+        self.variable_registry.set_variable_type(node.variable, node.data_type)
+        self.variable_registry.set_scalar_fields(node.variable, scalar_fields)
 
     def __declare_primitive_variable(self, node):
         llvm_type = node.data_type.to_llvm()
@@ -132,7 +250,7 @@ class CodeGenerator(ASTVisitor):
         if expr_type == DataType.I32 and node.data_type == DataType.I64:
             value = self.struct_ops.widen_to_i64(value)
 
-        self.emitter.emit_line(f"  {reg} = add {llvm_type} 0, {value}")
+        self.emitter.emit(Instruction.binary("add", llvm_type, "0", value).named(reg))
 
     def visit_assignment(self, node):
         if self.variable_registry.is_field_access_from_this(node.variable):
@@ -158,9 +276,18 @@ class CodeGenerator(ASTVisitor):
         if expr_type == DataType.I32 and var_type == DataType.I64:
             value = self.struct_ops.widen_to_i64(value)
 
-        self.emitter.emit_line(f"  {reg} = add {llvm_type} 0, {value}")
+        self.emitter.emit(Instruction.binary("add", llvm_type, "0", value).named(reg))
 
     def visit_return(self, node):
+        if self.func_gen.in_function and self.func_gen.is_self_tail_call(node.expr_node):
+            self.func_gen.generate_self_tail_call(node.expr_node, self)
+            return
+        if self.func_gen.in_function and self.func_gen.returns_struct():
+            self.func_gen.generate_struct_return(node.expr_node, self)
+            return
+        if self.func_gen.in_function and isinstance(node.expr_node, FunctionCallNode):
+            self.func_gen.mark_tail_call()
+
         value = node.expr_node.accept(self)
         return_type = self.type_converter.get_node_type(node.expr_node)
         self.__generate_function_return(value, return_type) \
@@ -170,7 +297,7 @@ class CodeGenerator(ASTVisitor):
         llvm_type = (self.type_converter.get_llvm_type(return_type)
                      if isinstance(return_type, str)
                      else return_type.to_llvm())
-        self.emitter.emit_line(f"  ret {llvm_type} {value}")
+        self.emitter.emit(Instruction.ret(llvm_type, value))
 
     def _generate_main_return(self, value: str, return_type):
         if not isinstance(return_type, DataType):
@@ -178,17 +305,17 @@ class CodeGenerator(ASTVisitor):
                                       f"Attempted to return value of type '{return_type}'")
 
         value = self.__cast_to_i32(value, return_type)
-        self.emitter.emit_line(f"  call void @printResult(i32 {value})")
-        self.emitter.emit_line(f"  ret i32 {value}")
+        self.emitter.emit(Instruction.call("printResult", "void", [("i32", value)]))
+        self.emitter.emit(Instruction.ret("i32", value))
 
     def __cast_to_i32(self, value: str, value_type: DataType) -> str:
         if value_type == DataType.BOOL:
             cast_reg = self.emitter.get_temp_register()
-            self.emitter.emit_line(f"  {cast_reg} = zext i1 {value} to i32")
+            self.emitter.emit(Instruction.cast("zext", value, "i1", "i32").named(cast_reg))
             return cast_reg
         elif value_type == DataType.I64:
             cast_reg = self.emitter.get_temp_register()
-            self.emitter.emit_line(f"  {cast_reg} = trunc i64 {value} to i32")
+            self.emitter.emit(Instruction.cast("trunc", value, "i64", "i32").named(cast_reg))
             return cast_reg
         return value
 
@@ -199,24 +326,21 @@ class CodeGenerator(ASTVisitor):
         left_type = self.type_converter.get_node_type(node.left)
         right_type = self.type_converter.get_node_type(node.right)
 
-        temp_reg = self.emitter.get_temp_register()
-
-        (self.__generate_comparison(node, left_value, right_value, left_type, right_type, temp_reg)
-         if node.operator.is_for_comparison()
-         else self.__generate_arithmetic(node, left_value, right_value, left_type, right_type, temp_reg))
+        instruction = (self.__generate_comparison(node, left_value, right_value, left_type, right_type)
+                       if node.operator.is_for_comparison()
+                       else self.__generate_arithmetic(node, left_value, right_value, left_type, right_type))
 
-        return temp_reg
+        return self.emitter.emit_value(instruction)
 
-    def __generate_comparison(self, node, left_value, right_value, left_type, right_type, temp_reg):
+    def __generate_comparison(self, node, left_value, right_value, left_type, right_type) -> Instruction:
         operand_type = self.type_converter.infer_operand_type(node.left, node.right)
 
         left_value = self.__widen_if_needed(left_value, left_type, operand_type)
         right_value = self.__widen_if_needed(right_value, right_type, operand_type)
 
-        llvm_op = node.operator.to_llvm()
-        self.emitter.emit_line(f"  {temp_reg} = {llvm_op} {operand_type} {left_value}, {right_value}")
+        return Instruction.compare(node.operator.to_llvm(), operand_type, left_value, right_value)
 
-    def __generate_arithmetic(self, node, left_value, right_value, left_type, right_type, temp_reg):
+    def __generate_arithmetic(self, node, left_value, right_value, left_type, right_type) -> Instruction:
         result_type = node.result_type if node.result_type else DataType.I32
         llvm_type = result_type.to_llvm()
 
@@ -224,8 +348,8 @@ class CodeGenerator(ASTVisitor):
             left_value = self.__widen_if_needed(left_value, left_type, "i64")
             right_value = self.__widen_if_needed(right_value, right_type, "i64")
 
-        llvm_op = node.operator.to_llvm()
-        self.emitter.emit_line(f"  {temp_reg} = {llvm_op} {llvm_type} {left_value}, {right_value}")
+        wrap_flags = ("nsw",) if self.no_signed_wrap else ()
+        return Instruction.binary(node.operator.to_llvm(), llvm_type, left_value, right_value, wrap_flags)
 
     def __widen_if_needed(self, value, current_type, target_type):
         if target_type == "i64" and current_type == DataType.I32:
@@ -244,18 +368,82 @@ class CodeGenerator(ASTVisitor):
         return Boolean.from_string(node.value).to_llvm()
 
     def visit_if_statement(self, node: IfNode):
+        analysis = IfConversionAnalyzer().analyze(node)
+        merged = [name for name in analysis.assigned_variables
+                  if isinstance(self.variable_registry.get_variable_type(name), DataType)
+                  and not self.variable_registry.is_field_access_from_this(name)]
+        if (self.options.select_lowering and analysis.can_lower_to_select()
+                and len(merged) == len(analysis.assigned_variables)):
+            self.__emit_select(node, merged)
+            return
+        switch = SwitchChainAnalyzer().analyze(node)
+        lowers_to_switch = (self.options.switch_lowering and switch.subject is not None and
+                            switch.can_lower_to_switch(self.type_converter.get_node_type(switch.subject)))
+        if lowers_to_switch:
+            self.__emit_switch(switch, merged)
+            return
+
         label_id = self.emitter.get_next_label_id()
         then_label, else_label, end_label = self.__generate_if_labels(label_id, node.else_block is not None)
 
         condition_value = node.condition.accept(self)
-        self.emitter.emit_line(f"  br i1 {condition_value}, label %{then_label}, label %{else_label}")
-
-        self.__emit_block_with_label(node.then_block, then_label, end_label)
+        condition_label = self.emitter.current_label
+        self.emitter.emit(Instruction.conditional_branch(condition_value, then_label, else_label))
 
+        incoming = [self.__emit_block_with_label(node.then_block, then_label, end_label, merged)]
         if node.else_block:
-            self.__emit_block_with_label(node.else_block, else_label, end_label)
+            incoming.append(self.__emit_block_with_label(node.else_block, else_label, end_label, merged))
+        else:
+            incoming.append((self.__get_versions(merged), condition_label))
 
         self.emitter.emit_label(end_label)
+        self.__merge_versions(merged, [edge for edge in incoming if edge], "phi")
+
+    def __emit_switch(self, switch: SwitchChainAnalyzer, merged: list[str]):
+        label_id = self.emitter.get_next_label_id()
+        case_labels = [f"case_{label_id}_{i}" for i in range(len(switch.cases))]
+        end_label = f"end_{label_id}"
+        default_label = f"default_{label_id}" if switch.default_block else end_label
+
+        subject_value = switch.subject.accept(self)
+        llvm_type = self.type_converter.get_node_type(switch.subject).to_llvm()
+        switch_label = self.emitter.current_label
+        targets = [(str(literal), label) for (literal, _), label in zip(switch.cases, case_labels)]
+        self.emitter.emit(Instruction.switch(llvm_type, subject_value, default_label, targets))
+
+        incoming = [self.__emit_block_with_label(block, label, end_label, merged)
+                    for (_, block), label in zip(switch.cases, case_labels)]
+        incoming.append(self.__emit_block_with_label(switch.default_block, default_label, end_label, merged)
+                        if switch.default_block else (self.__get_versions(merged), switch_label))
+
+        self.emitter.emit_label(end_label)
+        self.__merge_versions(merged, [edge for edge in incoming if edge], "phi")
+
+    def __emit_select(self, node: IfNode, merged: list[str]):
+        condition_value = node.condition.accept(self)
+        then_versions = self.__visit_scoped_block(node.then_block, merged)
+        else_versions = (self.__visit_scoped_block(node.else_block, merged)
+                         if node.else_block else self.__get_versions(merged))
+        self.__merge_versions(merged, [(then_versions, condition_value), (else_versions, None)], "select")
+
+    def __merge_versions(self, merged: list[str], edges: list[tuple[dict[str, int], str]], instruction: str):
+        for name in merged:
+            versions = [versions[name] for versions, _ in edges]
+            if len(set(versions)) == 1:
+                self.variable_registry.set_variable_version(name, versions[0])
+                continue
+
+            llvm_type = self.variable_registry.get_variable_type(name).to_llvm()
+            values = [self.variable_registry.get_version_register(name, version) for version in versions]
+            reg = self.variable_registry.get_variable_register(name)
+            if instruction == "select":
+                self.emitter.emit(Instruction.select(edges[0][1], llvm_type, values[0], values[1]).named(reg))
+            else:
+                incoming = [(value, label) for value, (_, label) in zip(values, edges)]
+                self.emitter.emit(Instruction.phi(llvm_type, incoming).named(reg))
+
+    def __get_versions(self, names: list[str]) -> dict[str, int]:
+        return {name: self.variable_registry.get_variable_version(name) or 0 for name in names}
 
     @staticmethod
     def __generate_if_labels(label_id: int, has_else: bool) -> tuple[str, str, str]:
@@ -264,23 +452,36 @@ class CodeGenerator(ASTVisitor):
         end_label = f"end_{label_id}"
         return then_label, else_label, end_label
 
-    def __emit_block_with_label(self, block: CodeBlockNode, label: str, end_label: str):
+    def __emit_block_with_label(self, block: CodeBlockNode, label: str, end_label: str,
+                                merged: list[str]) -> Optional[tuple[dict[str, int], str]]:
         self.emitter.emit_label(label)
-        block.accept(self)
-        if not block.return_node:
-            self.emitter.emit_line(f"  br label %{end_label}")
+        versions = self.__visit_scoped_block(block, merged)
+        if block.return_node:
+            return None
+        edge = (versions, self.emitter.current_label)
+        self.emitter.emit(Instruction.branch(end_label))
+        return edge
 
     def visit_code_block(self, node: CodeBlockNode):
+        self.__visit_scoped_block(node, [])
+
+    def __visit_scoped_block(self, node: CodeBlockNode, exported: list[str]) -> dict[str, int]:
         saved_state = self.variable_registry.copy_state()
-        [n.accept(self) for n in node.statements]
+        self.stack_slots.begin_scope()
+        outer_versions = {}
+        for statement in node.statements:
+            if isinstance(statement, DeclNode) and statement.variable in exported:
+                outer_versions = {**self.__get_versions([statement.variable]), **outer_versions}
+            self.__visit_statement(statement)
         if node.return_node:
-            node.return_node.accept(self)
+            self.__visit_statement(node.return_node)
+        self.stack_slots.end_scope()
+        versions = {**self.__get_versions(exported), **outer_versions}
         self.variable_registry.restore_state(saved_state)
+        return versions
 
     def visit_unary_operation(self, node):
         if node.operator == NOT:
             operand = node.operand.accept(self)
-            temp_reg = self.emitter.get_temp_register()
-            self.emitter.emit_line(f"  {temp_reg} = xor i1 {operand}, 1")
-            return temp_reg
+            return self.emitter.emit_value(Instruction.binary("xor", "i1", operand, "1"))
         raise ValueError(f"We do not support this unary operator: {node.operator}!")
\ No newline at end of file
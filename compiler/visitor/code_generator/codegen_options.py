@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+from ...constants import DEFAULT_INLINE_THRESHOLD
+from .struct_abi import POINTER_ABI
+
+
+class CodegenOptions:
+    def __init__(self, inline_threshold: int = DEFAULT_INLINE_THRESHOLD, memoize: bool = False,
+                 no_signed_wrap: bool = False, struct_abi: str = POINTER_ABI, peephole: bool = True,
+                 optimize: bool = True):
+        self.inline_threshold = inline_threshold
+        self.memoize = memoize
+        self.no_signed_wrap = no_signed_wrap
+        self.struct_abi = struct_abi
+        self.peephole = peephole
+        self.select_lowering = optimize
+        self.switch_lowering = optimize
+        self.value_numbering = optimize
+        self.cfg_simplification = optimize
+        self.scalar_replacement = optimize
+        self.constant_globals = optimize
+        self.slot_sharing = optimize
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+from typing import Optional
+from ...llvm_specifics.memory_effect import MemoryEffect
+from .ir_model import Instruction
+
+FUNCTION_LINKAGE = "internal"
+CALLING_CONVENTION = "fastcc"
+NO_UNWIND = "nounwind"
+
+
+class FunctionAttributes:
+    def __init__(self):
+        self.side_effects = None
+        self.global_writers: set[str] = set()
+
+    def configure(self, side_effects, memoized_functions: set[str]):
+        self.side_effects = side_effects
+        self.global_writers = {name for name in side_effects.effects
+                               if name in memoized_functions or
+                               side_effects.reachable_from(name) & memoized_functions}
+
+    @staticmethod
+    def build_define_prefix(return_llvm_type: str) -> str:
+        return f"define {FUNCTION_LINKAGE} {CALLING_CONVENTION} {return_llvm_type}"
+
+    @staticmethod
+    def build_call(symbol: str, return_llvm_type: str, arguments: list[tuple[str, str]],
+                   tail_marker: Optional[str] = None) -> Instruction:
+        return Instruction.call(symbol, return_llvm_type, arguments, tail_marker, CALLING_CONVENTION)
+
+    def build_function_attributes(self, func_name: str) -> str:
+        memory_effect = (MemoryEffect.WRITES if func_name in self.global_writers
+                         else self.side_effects.get_effect(func_name))
+        return " ".join(attr for attr in (NO_UNWIND, memory_effect.to_llvm()) if attr)
@@ -1,31 +1,81 @@
 #!/usr/bin/env python3
 from typing import Optional
 from ...llvm_specifics.data_type import DataType
+from ..analysis.tail_call_analyzer import TailCallAnalyzer
+from ...node.function_call_node import FunctionCallNode
+from ...node.id_node import IDNode
+from ...node.struct_init_node import StructInitNode
+from .llvm_emitter import ENTRY_LABEL
+from .function_attributes import FunctionAttributes
+from .ir_model import Instruction
+
+THIS_POINTER = "%this"
+SRET_POINTER = "%sret.ptr"
+TAIL_RECURSION_LABEL = "tailrecurse"
 
 
 class FunctionGenerator:
-    def __init__(self, emitter, variable_registry, type_converter, struct_ops):
+    def __init__(self, emitter, variable_registry, type_converter, struct_ops, stack_slots, inliner, memoizer,
+                 attributes: FunctionAttributes, struct_abi):
         self.emitter = emitter
         self.variable_registry = variable_registry
         self.type_converter = type_converter
         self.struct_ops = struct_ops
+        self.stack_slots = stack_slots
+        self.inliner = inliner
+        self.memoizer = memoizer
+        self.attributes = attributes
+        self.struct_abi = struct_abi
         self.function_return_types = {}
         self.current_struct_context: Optional[str] = None
+        self.current_function: Optional[str] = None
+        self.this_pointer = THIS_POINTER
         self.in_function = False
+        self.lowers_tail_recursion = False
+        self.tail_recursion_edges: list[tuple[str, list[str]]] = []
+        self.pending_tail_call = False
+        self.sret_type: Optional[str] = None
+        self.result_slot: Optional[str] = None
+
+    def register_function_signatures(self, program_node):
+        for func_decl in program_node.func_decls:
+            self.function_return_types[func_decl.variable] = func_decl.return_type
+        for struct_decl in program_node.struct_decls:
+            for member_func in struct_decl.member_functions:
+                self.function_return_types[f"{struct_decl.variable}_{member_func.variable}"] = member_func.return_type
 
     def generate_standalone_function(self, node, visitor):
-        self.__prepare_function_context(node.variable, node.return_type)
+        if self.memoizer.should_memoize(node):
+            self.__generate_memoized_function(node, visitor)
+            return
+
+        self.__prepare_function_context(node.variable, node)
         func_signature = self.__build_function_signature(node)
         self.__initialize_function_body(node, visitor, func_signature)
         self.__finalize_function()
 
+    def __generate_memoized_function(self, node, visitor):
+        body_name = self.memoizer.body_name(node.variable)
+        self.__prepare_function_context(body_name, node, allow_loop_lowering=False)
+        self.__initialize_function_body(node, visitor,
+                                        self.__build_function_signature(node, body_name, node.variable))
+        self.__finalize_function()
+
+        self.memoizer.register_memo_table(node)
+        self.__prepare_function_context(node.variable, node, allow_loop_lowering=False)
+        self.memoizer.emit_lookup_wrapper(node)
+        self.__store_function_definition(self.__build_function_signature(node))
+        self.__finalize_function()
+
     def __finalize_function(self):
         self.__restore_state(self._saved_state)
+        self.current_function = None
+        self.sret_type = None
         self.in_function = False
 
     def generate_member_function(self, struct_name: str, node, visitor):
         mangled_name = f"{struct_name}_{node.variable}"
-        self.__prepare_function_context(mangled_name, node.return_type)
+        self.__prepare_function_context(mangled_name, node)
 
         func_signature = self.__build_member_function_signature(struct_name, node, mangled_name)
         self.__setup_this_context(struct_name)
@@ -35,16 +85,17 @@ class FunctionGenerator:
         self.__finalize_function()
 
     def generate_regular_function_call(self, node, visitor) -> str:
+        is_tail_call = self.__take_tail_call_marker()
+        result_slot = self.__take_result_slot()
         if self.current_struct_context and self.__is_member_function(node.value):
-            return self.__generate_member_to_member_call(node, visitor)
-        
-        args = [self.__build_call_argument(arg, visitor) for arg in node.arguments]
-        result_reg = self.emitter.get_temp_register()
-        return_type = self.type_converter.get_node_type(node)
+            return self.__generate_member_to_member_call(node, visitor, is_tail_call, result_slot)
+        if self.inliner.should_inline(node.value, self.current_function):
+            return self.__inline_call(node.value, None, self.this_pointer, node, visitor)
 
-        return_llvm_type = self.__get_llvm_type(return_type)
-        self.emitter.emit_line(f"  {result_reg} = call {return_llvm_type} @{node.value}({', '.join(args)})")
-        return result_reg
+        args = self.__build_call_arguments(node.value, node, visitor)
+        return_type = self.type_converter.get_node_type(node)
+        tail_marker = self.__get_tail_marker(is_tail_call, node.value, node, return_type)
+        return self.__emit_call(tail_marker, return_type, node.value, args, result_slot)
     
     def __is_member_function(self, func_name: str) -> bool:
         if not self.current_struct_context:
@@ -57,45 +108,130 @@ class FunctionGenerator:
         mangled_name = f"{struct_name}_{func_name}"
         return mangled_name in self.function_return_types
     
-    def __generate_member_to_member_call(self, node, visitor) -> str:
+    def __generate_member_to_member_call(self, node, visitor, is_tail_call: bool, result_slot: Optional[str]) -> str:
         struct_name = self.current_struct_context
         mangled_name = f"{struct_name}_{node.value}"
+        if self.inliner.should_inline(mangled_name, self.current_function):
+            return self.__inline_call(mangled_name, struct_name, self.this_pointer, node, visitor)
+
+        arguments = [(f"%struct.{struct_name}*", self.this_pointer)] + self.__build_call_arguments(
+            mangled_name, node, visitor)
         
-        arg_strs = [f"%struct.{struct_name}* %this"] + [
-            self.__build_call_argument(arg, visitor) for arg in node.arguments]
-        
-        result_reg = self.emitter.get_temp_register()
         return_type = self.type_converter.get_node_type(node)
-        return_llvm_type = self.__get_llvm_type(return_type)
-        
-        self.emitter.emit_line(f"  {result_reg} = call {return_llvm_type} @{mangled_name}({', '.join(arg_strs)})")
-        return result_reg
+        tail_marker = self.__get_tail_marker(is_tail_call and self.this_pointer == THIS_POINTER,
+                                             mangled_name, node, return_type)
+        return self.__emit_call(tail_marker, return_type, mangled_name, arguments, result_slot)
 
     def generate_member_function_call(self, node, visitor) -> str:
+        self.__take_tail_call_marker()
+        result_slot = self.__take_result_slot()
         object_chain = node.field_chain.fields
         struct_type = self.type_converter.get_object_type_from_chain(object_chain)
         object_ptr = self.struct_ops.get_object_pointer_from_chain(object_chain)
         mangled_name = f"{struct_type}_{node.value}"
+        if self.inliner.should_inline(mangled_name, self.current_function):
+            return self.__inline_call(mangled_name, struct_type, object_ptr, node, visitor)
 
-        arg_strs = [f"%struct.{struct_type}* {object_ptr}"] + [
-            self.__build_call_argument(arg, visitor) for arg in node.arguments]
+        arguments = [(f"%struct.{struct_type}*", object_ptr)] + self.__build_call_arguments(
+            mangled_name, node, visitor)
 
-        result_reg = self.emitter.get_temp_register()
         return_type = self.type_converter.get_node_type(node)
-        return_llvm_type = self.__get_llvm_type(return_type)
+        return self.__emit_call(None, return_type, mangled_name, arguments, result_slot)
 
-        self.emitter.emit_line(f"  {result_reg} = call {return_llvm_type} @{mangled_name}({', '.join(arg_strs)})")
+    def __emit_call(self, tail_marker: Optional[str], return_type, symbol: str, arguments: list[tuple[str, str]],
+                    result_slot: Optional[str]) -> str:
+        if isinstance(return_type, str):
+            result_slot = result_slot or self.stack_slots.allocate_temporary(return_type)
+            arguments = [(f"%struct.{return_type}*", result_slot)] + arguments
+            self.emitter.emit(self.attributes.build_call(symbol, "void", arguments, tail_marker))
+            return result_slot
+
+        result_reg = self.emitter.get_temp_register()
+        self.emitter.emit(self.attributes.build_call(
+            symbol, self.__get_llvm_type(return_type), arguments, tail_marker).named(result_reg))
         return result_reg
 
+    def returns_struct(self) -> bool:
+        return self.sret_type is not None
+
+    def construct_struct_into(self, slot: str, struct_name: str, expr_node, visitor):
+        if isinstance(expr_node, StructInitNode):
+            self.struct_ops.initialize_struct_fields(expr_node, slot, visitor)
+            return
+
+        if isinstance(expr_node, FunctionCallNode):
+            self.result_slot = slot
+        struct_value = expr_node.accept(visitor)
+        if struct_value != slot:
+            self.struct_ops.copy_struct(struct_name, struct_value, slot)
+
+    def generate_struct_return(self, expr_node, visitor):
+        self.construct_struct_into(SRET_POINTER, self.sret_type, expr_node, visitor)
+        self.emitter.emit(Instruction.ret("void"))
+
+    def __take_result_slot(self) -> Optional[str]:
+        result_slot, self.result_slot = self.result_slot, None
+        return result_slot
+
+    def mark_tail_call(self):
+        self.pending_tail_call = True
+
+    def __take_tail_call_marker(self) -> bool:
+        is_tail_call, self.pending_tail_call = self.pending_tail_call, False
+        return is_tail_call
+
+    def __get_tail_marker(self, is_tail_call: bool, callee_name: str, node, return_type) -> Optional[str]:
+        arg_types = [self.type_converter.get_node_type(arg) for arg in node.arguments]
+        if not is_tail_call or not all(isinstance(t, DataType) for t in arg_types + [return_type]):
+            return None
+
+        caller = self.inliner.function_nodes.get(self.current_function)
+        callee = self.inliner.function_nodes.get(callee_name)
+        if caller and callee and self.__have_same_prototype(self.current_function, caller, callee_name, callee):
+            return "musttail"
+        return "tail"
+
+    @staticmethod
+    def __have_same_prototype(caller_name: str, caller, callee_name: str, callee) -> bool:
+        caller_struct = caller_name.removesuffix(caller.variable)
+        callee_struct = callee_name.removesuffix(callee.variable)
+        return (caller_struct == callee_struct and caller.return_type == callee.return_type and
+                [p.param_type for p in caller.params] == [p.param_type for p in callee.params])
+
+    def is_self_tail_call(self, expr_node) -> bool:
+        if not self.lowers_tail_recursion:
+            return False
+        func_name = self.current_function.removeprefix(f"{self.current_struct_context}_") \
+            if self.current_struct_context else self.current_function
+        return TailCallAnalyzer.is_self_call(expr_node, func_name)
+
+    def generate_self_tail_call(self, node, visitor):
+        params = self.inliner.function_nodes[self.current_function].params
+        values = []
+        for param, arg in zip(params, node.arguments):
+            value = arg.accept(visitor)
+            arg_type = self.type_converter.get_node_type(arg)
+            values.append(self.struct_ops.convert_type_if_needed(value, arg_type, param.param_type))
+
+        self.tail_recursion_edges.append((self.emitter.current_label, values))
+        self.emitter.emit(Instruction.branch(TAIL_RECURSION_LABEL))
+
+    def __inline_call(self, mangled_name: str, struct_name: Optional[str], this_ptr: str, node, visitor) -> str:
+        arguments = [(arg.accept(visitor), self.type_converter.get_node_type(arg)) for arg in node.arguments]
+
+        saved_context = (self.current_struct_context, self.this_pointer)
+        self.current_struct_context, self.this_pointer = struct_name, this_ptr
+        result = self.inliner.inline_call(mangled_name, arguments, visitor, struct_name)
+        self.current_struct_context, self.this_pointer = saved_context
+        return result
+
     def load_field_from_this(self, field_name: str) -> str:
         field_ptr, field_llvm_type = self.__get_this_field_pointer(field_name)
-        field_value = self.emitter.get_temp_register()
-        self.emitter.emit_line(f"  {field_value} = load {field_llvm_type}, {field_llvm_type}* {field_ptr}")
-        return field_value
+        return self.struct_ops.load_value(field_llvm_type, field_ptr)
 
     def store_field_to_this(self, field_name: str, value: str):
         field_ptr, field_llvm_type = self.__get_this_field_pointer(field_name)
-        self.emitter.emit_line(f"  store {field_llvm_type} {value}, {field_llvm_type}* {field_ptr}")
+        self.emitter.emit(Instruction.store(field_llvm_type, value, field_ptr))
 
     @staticmethod
     def __get_llvm_type(data_type) -> str:
@@ -111,36 +247,66 @@ class FunctionGenerator:
         field_index = next(i for i, (name, _, _) in enumerate(fields) if name == field_name)
         field_llvm_type = fields[field_index][1]
 
-        field_ptr = self.emitter.get_temp_register()
-        self.emitter.emit_line(f"  {field_ptr} = getelementptr inbounds %struct.{struct_name}, "
-                               f"%struct.{struct_name}* %this, i32 0, i32 {field_index}")
+        field_ptr = self.struct_ops.get_struct_field_ptr(struct_name, self.this_pointer, field_index)
         return field_ptr, field_llvm_type
 
-    def __prepare_function_context(self, func_name: str, return_type):
-        self.function_return_types[func_name] = return_type
+    def __prepare_function_context(self, func_name: str, node, allow_loop_lowering: bool = True):
+        self.function_return_types[func_name] = node.return_type
+        self.sret_type = None if DataType.is_data_type(node.return_type) else node.return_type
         self._saved_state = self.__save_state()
         self.__reset_for_function()
+        self.current_function = func_name
         self.in_function = True
+        self.lowers_tail_recursion = (allow_loop_lowering and
+                                      TailCallAnalyzer(node.variable).analyze(node).can_lower_to_loop())
+        self.tail_recursion_edges = []
 
     def __initialize_function_body(self, node, visitor, func_signature: str):
         self.__declare_function_params(node)
+        if self.lowers_tail_recursion:
+            self.emitter.current_label = TAIL_RECURSION_LABEL
         node.body.accept(visitor)
+        if self.lowers_tail_recursion:
+            self.__emit_tail_recursion_header(node)
         self.__store_function_definition(func_signature)
 
-    def __build_function_signature(self, node) -> str:
-        param_strs = [self.__build_param_string(p) for p in node.params]
-        return_llvm_type = self.__get_llvm_type(node.return_type)
-        return f"define {return_llvm_type} @{node.variable}({', '.join(param_strs)}) {{"
+    def __emit_tail_recursion_header(self, node):
+        phis = []
+        for i, param in enumerate(node.params):
+            incoming = [(f"%{param.name}.arg", ENTRY_LABEL)] + [
+                (values[i], label) for label, values in self.tail_recursion_edges]
+            phis.append(Instruction.phi(self.__get_llvm_type(param.param_type), incoming).named(f"%{param.name}"))
+        self.emitter.emit_loop_header(TAIL_RECURSION_LABEL, phis)
+
+    def __build_function_signature(self, node, symbol: Optional[str] = None,
+                                   effect_name: Optional[str] = None) -> str:
+        param_strs = self.__build_sret_params() + [self.__build_param_string(p) for p in node.params]
+        define_prefix = self.attributes.build_define_prefix(self.__get_return_llvm_type(node.return_type))
+        func_attrs = self.attributes.build_function_attributes(effect_name or node.variable)
+        return f"{define_prefix} @{symbol or node.variable}({', '.join(param_strs)}) {func_attrs} {{"
 
     def __build_member_function_signature(self, struct_name: str, node, mangled_name: str) -> str:
-        return_llvm_type = self.__get_llvm_type(node.return_type)
-        param_strs = [f"%struct.{struct_name}* %this"] + [
+        define_prefix = self.attributes.build_define_prefix(self.__get_return_llvm_type(node.return_type))
+        param_strs = self.__build_sret_params() + [f"%struct.{struct_name}* {THIS_POINTER}"] + [
             self.__build_param_string(p) for p in node.params]
-        return f"define {return_llvm_type} @{mangled_name}({', '.join(param_strs)}) {{"
+        func_attrs = self.attributes.build_function_attributes(mangled_name)
+        return f"{define_prefix} @{mangled_name}({', '.join(param_strs)}) {func_attrs} {{"
+
+    def __get_return_llvm_type(self, return_type) -> str:
+        return "void" if self.returns_struct() else self.__get_llvm_type(return_type)
+
+    def __build_sret_params(self) -> list[str]:
+        if not self.returns_struct():
+            return []
+        return [f"%struct.{self.sret_type}* noalias sret(%struct.{self.sret_type}) {SRET_POINTER}"]
 
     def __build_param_string(self, param) -> str:
+        if self.struct_abi.is_scalar_param(self.current_function, param.name):
+            return ", ".join(f"{llvm_type} %{param.name}.{field_name}"
+                             for field_name, llvm_type in self.struct_abi.get_scalar_fields(param.param_type))
         llvm_type = self.__get_llvm_type(param.param_type)
-        return f"{llvm_type} %{param.name}"
+        suffix = ".arg" if self.lowers_tail_recursion else ""
+        return f"{llvm_type} %{param.name}{suffix}"
 
     def __declare_function_params(self, node):
         for param in node.params:
@@ -148,10 +314,28 @@ class FunctionGenerator:
                         if DataType.is_data_type(param.param_type)
                         else param.param_type)
             self.variable_registry.set_variable_type(param.name, var_type)
-            self.variable_registry.set_variable_version(param.name, 0)
+            self.variable_registry.get_variable_register(param.name)
+            if self.struct_abi.is_scalar_param(self.current_function, param.name):
+                self.__bind_scalar_param(param)
+
+    def __bind_scalar_param(self, param):
+        struct_type = f"%struct.{param.param_type}"
+        fields = self.struct_abi.get_scalar_fields(param.param_type)
+        if self.struct_abi.needs_struct_view(self.current_function, param.name):
+            aggregate = "undef"
+            for i, (field_name, llvm_type) in enumerate(fields):
+                next_aggregate = self.emitter.get_temp_register()
+                self.emitter.emit(Instruction.insert_value(
+                    struct_type, aggregate, llvm_type, f"%{param.name}.{field_name}", i).named(next_aggregate))
+                aggregate = next_aggregate
+            self.emitter.emit_alloca(f"%{param.name}", struct_type)
+            self.emitter.emit(Instruction.store(struct_type, aggregate, f"%{param.name}"))
+
+        self.variable_registry.set_scalar_fields(
+            param.name, {field_name: f"%{param.name}.{field_name}" for field_name, _ in fields})
 
     def __store_function_definition(self, signature: str):
-        lines = [signature] + self.emitter.translated_lines + ["}", ""]
+        lines = [signature] + self.emitter.build_function_body() + ["}", ""]
         self.emitter.add_function_definition(lines)
 
     def __setup_this_context(self, struct_name: str):
@@ -163,23 +347,51 @@ class FunctionGenerator:
             self.variable_registry.set_variable_type(field_name, field_type)
             self.variable_registry.set_variable_version(field_name, -1)
 
-    def __build_call_argument(self, arg, visitor) -> str:
+    def __build_call_arguments(self, callee_name: str, node, visitor) -> list[tuple[str, str]]:
+        callee = self.inliner.function_nodes.get(callee_name)
+        arguments = []
+        for index, arg in enumerate(node.arguments):
+            if callee and self.struct_abi.is_scalar_param(callee_name, callee.params[index].name):
+                arguments.extend(self.__build_scalar_arguments(arg, visitor))
+            else:
+                arguments.append(self.__build_call_argument(arg, visitor))
+        return arguments
+
+    def __build_scalar_arguments(self, arg, visitor) -> list[tuple[str, str]]:
+        struct_name = self.type_converter.get_node_type(arg)
+        fields = self.struct_abi.get_scalar_fields(struct_name)
+        scalar_fields = self.variable_registry.get_scalar_fields(arg.value) if isinstance(arg, IDNode) else None
+        if scalar_fields:
+            return [(llvm_type, scalar_fields[field_name]) for field_name, llvm_type in fields]
+
+        aggregate = self.struct_ops.load_value(f"%struct.{struct_name}", arg.accept(visitor))
+        arguments = []
+        for i, (_, llvm_type) in enumerate(fields):
+            field_value = self.emitter.get_temp_register()
+            self.emitter.emit(Instruction.extract_value(f"%struct.{struct_name}", aggregate, i).named(field_value))
+            arguments.append((llvm_type, field_value))
+        return arguments
+
+    def __build_call_argument(self, arg, visitor) -> tuple[str, str]:
         arg_value = arg.accept(visitor)
         arg_type = self.type_converter.get_node_type(arg)
-        arg_llvm_type = self.__get_llvm_type(arg_type)
-        return f"{arg_llvm_type} {arg_value}"
+        return self.__get_llvm_type(arg_type), arg_value
 
     def __save_state(self) -> dict:
         return {
             "emitter": self.emitter.copy_state(),
             "variable_registry": self.variable_registry.copy_state(),
+            "stack_slots": self.stack_slots.copy_state(),
             "in_function": self.in_function}
 
     def __restore_state(self, state: dict):
         self.emitter.restore_state(state["emitter"])
+        self.variable_registry.reset()
         self.variable_registry.restore_state(state["variable_registry"])
+        self.stack_slots.restore_state(state["stack_slots"])
         self.in_function = state["in_function"]
 
     def __reset_for_function(self):
         self.emitter.reset_for_function()
-        self.variable_registry.reset()
\ No newline at end of file
+        self.variable_registry.reset()
+        self.stack_slots.reset()
\ No newline at end of file
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+from typing import Optional
+from ...llvm_specifics.data_type import DataType
+from ...node.function_decl_node import FunctionDeclNode
+from ..analysis.inline_cost_analyzer import InlineCostAnalyzer
+from .ir_model import Instruction
+
+MAX_INLINE_DEPTH = 8
+
+
+class FunctionInliner:
+    def __init__(self, emitter, variable_registry, type_converter, struct_ops, threshold: int):
+        self.emitter = emitter
+        self.variable_registry = variable_registry
+        self.type_converter = type_converter
+        self.struct_ops = struct_ops
+        self.threshold = threshold
+        self.function_nodes: dict[str, FunctionDeclNode] = {}
+        self.inline_stack: list[str] = []
+        self.inline_decisions: dict[str, bool] = {}
+
+    def register_functions(self, program_node):
+        for func_decl in program_node.func_decls:
+            self.function_nodes[func_decl.variable] = func_decl
+        for struct_decl in program_node.struct_decls:
+            for member_func in struct_decl.member_functions:
+                self.function_nodes[f"{struct_decl.variable}_{member_func.variable}"] = member_func
+
+    def should_inline(self, mangled_name: str, current_function: Optional[str]) -> bool:
+        if mangled_name not in self.function_nodes or mangled_name == current_function:
+            return False
+        if mangled_name in self.inline_stack or len(self.inline_stack) >= MAX_INLINE_DEPTH:
+            return False
+        return self.is_candidate(mangled_name)
+
+    def is_candidate(self, mangled_name: str) -> bool:
+        if mangled_name not in self.function_nodes:
+            return False
+        if mangled_name not in self.inline_decisions:
+            self.inline_decisions[mangled_name] = self.__fits_cost_model(self.function_nodes[mangled_name])
+        return self.inline_decisions[mangled_name]
+
+    def __fits_cost_model(self, node: FunctionDeclNode) -> bool:
+        if self.threshold <= 0:
+            return False
+        cost = InlineCostAnalyzer(node.variable).analyze(node)
+        return not cost.has_branches and not cost.is_recursive and cost.size <= self.threshold
+
+    def inline_call(self, mangled_name: str, arguments: list[tuple[str, object]],
+                    visitor, struct_name: Optional[str] = None) -> str:
+        node = self.function_nodes[mangled_name]
+        saved_state = self.variable_registry.copy_state()
+        self.inline_stack.append(mangled_name)
+
+        if struct_name:
+            self.__bind_this_fields(struct_name)
+        for param, (value, arg_type) in zip(node.params, arguments):
+            self.__bind_parameter(param, value, arg_type)
+
+        [stmt.accept(visitor) for stmt in node.body.statements]
+        result = self.__evaluate_return_value(node, visitor)
+
+        self.inline_stack.pop()
+        self.variable_registry.restore_state(saved_state)
+        return result
+
+    def __bind_this_fields(self, struct_name: str):
+        for field_name, _, field_data_type in self.struct_ops.struct_definitions[struct_name]:
+            field_type = (DataType.from_string(field_data_type)
+                          if DataType.is_data_type(field_data_type)
+                          else field_data_type)
+            self.variable_registry.set_variable_type(field_name, field_type)
+            self.variable_registry.set_variable_version(field_name, -1)
+
+    def __bind_parameter(self, param, value: str, arg_type):
+        reg = self.variable_registry.get_variable_register(param.name)
+
+        if DataType.is_data_type(param.param_type):
+            param_type = DataType.from_string(param.param_type)
+            if arg_type == DataType.I32 and param_type == DataType.I64:
+                value = self.struct_ops.widen_to_i64(value)
+            self.emitter.emit(Instruction.binary("add", param_type.to_llvm(), "0", value).named(reg))
+        else:
+            param_type = param.param_type
+            self.emitter.emit(Instruction.element_pointer(f"%struct.{param_type}", value, [("i32", "0")]).named(reg))
+
+        self.variable_registry.set_variable_type(param.name, param_type)
+
+    def __evaluate_return_value(self, node: FunctionDeclNode, visitor) -> str:
+        expr_node = node.body.return_node.expr_node
+        value = expr_node.accept(visitor)
+        expr_type = self.type_converter.get_node_type(expr_node)
+        return self.struct_ops.convert_type_if_needed(value, expr_type, node.return_type)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+from ...llvm_specifics.data_type import DataType
+from ...llvm_specifics.memory_effect import MemoryEffect
+from .function_attributes import FunctionAttributes
+from .ir_model import Instruction
+
+MEMO_TABLE_SLOTS = 1024
+HASH_MULTIPLIER = -7046029254386353131
+MEMO_HIT_LABEL = "memo_hit"
+MEMO_MISS_LABEL = "memo_miss"
+
+
+class FunctionMemoizer:
+    def __init__(self, emitter, enabled: bool):
+        self.emitter = emitter
+        self.enabled = enabled
+        self.memoized_functions: set[str] = set()
+
+    def select_functions(self, program, side_effects):
+        self.memoized_functions = {func_decl.variable for func_decl in program.func_decls
+                                   if self.__is_memoizable(func_decl, side_effects)}
+
+    def should_memoize(self, node) -> bool:
+        return node.variable in self.memoized_functions
+
+    def __is_memoizable(self, node, side_effects) -> bool:
+        if not self.enabled or not node.params or not DataType.is_data_type(node.return_type):
+            return False
+        if not all(DataType.is_data_type(param.param_type) for param in node.params):
+            return False
+        return (side_effects.get_effect(node.variable) == MemoryEffect.READ_NONE and
+                side_effects.is_recursive(node.variable))
+
+    @staticmethod
+    def body_name(func_name: str) -> str:
+        return f"{func_name}.body"
+
+    def register_memo_table(self, node):
+        entry_type = self.__entry_type(node.variable)
+        field_types = ["i1"] + [self.__llvm_type(p.param_type) for p in node.params] + [
+            self.__llvm_type(node.return_type)]
+
+        self.emitter.add_struct_type_definition(f"{entry_type} = type {{ {', '.join(field_types)} }}")
+        self.emitter.add_global_definition(f"@memo.{node.variable} = internal global "
+                                           f"[{MEMO_TABLE_SLOTS} x {entry_type}] zeroinitializer")
+
+    def emit_lookup_wrapper(self, node):
+        slot_ptr = self.__emit_slot_pointer(node)
+        valid_ptr = self.__get_entry_field_ptr(node.variable, slot_ptr, 0)
+        is_hit = self.emitter.get_temp_register()
+        self.emitter.emit(Instruction.load("i1", valid_ptr).named(is_hit))
+
+        for i, param in enumerate(node.params, start=1):
+            is_hit = self.__emit_key_comparison(node.variable, slot_ptr, i, param, is_hit)
+
+        self.emitter.emit(Instruction.conditional_branch(is_hit, MEMO_HIT_LABEL, MEMO_MISS_LABEL))
+        self.__emit_hit_block(node, slot_ptr)
+        self.__emit_miss_block(node, slot_ptr, valid_ptr)
+
+    def __emit_slot_pointer(self, node) -> str:
+        hash_value = "0"
+        for param in node.params:
+            extended = self.__extend_to_i64(f"%{param.name}", DataType.from_string(param.param_type))
+            mixed = self.emitter.get_temp_register()
+            self.emitter.emit(Instruction.binary("xor", "i64", hash_value, extended).named(mixed))
+            hash_value = self.emitter.get_temp_register()
+            self.emitter.emit(Instruction.binary("mul", "i64", mixed, str(HASH_MULTIPLIER)).named(hash_value))
+
+        slot_index = self.emitter.get_temp_register()
+        shift = str(64 - (MEMO_TABLE_SLOTS.bit_length() - 1))
+        self.emitter.emit(Instruction.binary("lshr", "i64", hash_value, shift).named(slot_index))
+
+        table_type = f"[{MEMO_TABLE_SLOTS} x {self.__entry_type(node.variable)}]"
+        slot_ptr = self.emitter.get_temp_register()
+        self.emitter.emit(Instruction.element_pointer(
+            table_type, f"@memo.{node.variable}", [("i64", "0"), ("i64", slot_index)]).named(slot_ptr))
+        return slot_ptr
+
+    def __emit_key_comparison(self, func_name: str, slot_ptr: str, index: int, param, is_hit: str) -> str:
+        llvm_type = self.__llvm_type(param.param_type)
+        key_ptr = self.__get_entry_field_ptr(func_name, slot_ptr, index)
+        key = self.emitter.get_temp_register()
+        self.emitter.emit(Instruction.load(llvm_type, key_ptr).named(key))
+
+        is_equal = self.emitter.get_temp_register()
+        self.emitter.emit(Instruction.compare("eq", llvm_type, key, f"%{param.name}").named(is_equal))
+        combined = self.emitter.get_temp_register()
+        self.emitter.emit(Instruction.binary("and", "i1", is_hit, is_equal).named(combined))
+        return combined
+
+    def __emit_hit_block(self, node, slot_ptr: str):
+        return_type = self.__llvm_type(node.return_type)
+        self.emitter.emit_label(MEMO_HIT_LABEL)
+        result_ptr = self.__get_entry_field_ptr(node.variable, slot_ptr, len(node.params) + 1)
+        cached = self.emitter.get_temp_register()
+        self.emitter.emit(Instruction.load(return_type, result_ptr).named(cached))
+        self.emitter.emit(Instruction.ret(return_type, cached))
+
+    def __emit_miss_block(self, node, slot_ptr: str, valid_ptr: str):
+        return_type = self.__llvm_type(node.return_type)
+        self.emitter.emit_label(MEMO_MISS_LABEL)
+
+        args = [(self.__llvm_type(p.param_type), f"%{p.name}") for p in node.params]
+        result = self.emitter.get_temp_register()
+        self.emitter.emit(FunctionAttributes.build_call(
+            self.body_name(node.variable), return_type, args).named(result))
+
+        self.emitter.emit(Instruction.store("i1", "1", valid_ptr))
+        for i, param in enumerate(node.params, start=1):
+            llvm_type = self.__llvm_type(param.param_type)
+            key_ptr = self.__get_entry_field_ptr(node.variable, slot_ptr, i)
+            self.emitter.emit(Instruction.store(llvm_type, f"%{param.name}", key_ptr))
+
+        result_ptr = self.__get_entry_field_ptr(node.variable, slot_ptr, len(node.params) + 1)
+        self.emitter.emit(Instruction.store(return_type, result, result_ptr))
+        self.emitter.emit(Instruction.ret(return_type, result))
+
+    def __get_entry_field_ptr(self, func_name: str, slot_ptr: str, index: int) -> str:
+        entry_type = self.__entry_type(func_name)
+        field_ptr = self.emitter.get_temp_register()
+        self.emitter.emit(Instruction.element_pointer(
+            entry_type, slot_ptr, [("i32", "0"), ("i32", str(index))]).named(field_ptr))
+        return field_ptr
+
+    def __extend_to_i64(self, value: str, data_type: DataType) -> str:
+        if data_type == DataType.I64:
+            return value
+        extended = self.emitter.get_temp_register()
+        cast = "zext" if data_type == DataType.BOOL else "sext"
+        self.emitter.emit(Instruction.cast(cast, value, data_type.to_llvm(), "i64").named(extended))
+        return extended
+
+    @staticmethod
+    def __entry_type(func_name: str) -> str:
+        return f"%memo.{func_name}"
+
+    @staticmethod
+    def __llvm_type(type_name: str) -> str:
+        return DataType.from_string(type_name).to_llvm()
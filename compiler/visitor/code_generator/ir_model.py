@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+from typing import Iterator, Optional
+
+TERMINATOR_OPCODES = {"ret", "br", "switch"}
+MUSTTAIL_MARKER = "musttail"
+
+
+def is_register(value: str) -> bool:
+    return value.startswith("%")
+
+
+class Instruction:
+    __slots__ = ("result", "opcode", "flags", "type", "result_type", "tokens", "operand_slots", "label_slots")
+
+    def __init__(self, opcode: str, llvm_type: Optional[str], result_type: Optional[str],
+                 flags: tuple[str, ...] = ()):
+        self.result: Optional[str] = None
+        self.opcode = opcode
+        self.flags = flags
+        self.type = llvm_type
+        self.result_type = result_type
+        self.tokens = [""]
+        self.operand_slots: list[int] = []
+        self.label_slots: list[int] = []
+
+    @staticmethod
+    def binary(opcode: str, llvm_type: str, left: str, right: str, flags: tuple[str, ...] = ()) -> 'Instruction':
+        instruction = Instruction(opcode, llvm_type, llvm_type, flags)
+        instruction.__text(" ".join((opcode,) + flags + (llvm_type,)) + " ")
+        return instruction.__operand(left).__text(", ").__operand(right)
+
+    @staticmethod
+    def compare(predicate: str, llvm_type: str, left: str, right: str) -> 'Instruction':
+        instruction = Instruction("icmp", llvm_type, "i1", (predicate,))
+        instruction.__text(f"icmp {predicate} {llvm_type} ")
+        return instruction.__operand(left).__text(", ").__operand(right)
+
+    @staticmethod
+    def cast(opcode: str, value: str, from_type: str, to_type: str) -> 'Instruction':
+        instruction = Instruction(opcode, from_type, to_type)
+        return instruction.__text(f"{opcode} {from_type} ").__operand(value).__text(f" to {to_type}")
+
+    @staticmethod
+    def alloca(llvm_type: str) -> 'Instruction':
+        return Instruction("alloca", llvm_type, f"{llvm_type}*").__text(f"alloca {llvm_type}")
+
+    @staticmethod
+    def load(llvm_type: str, pointer: str) -> 'Instruction':
+        instruction = Instruction("load", llvm_type, llvm_type)
+        return instruction.__text(f"load {llvm_type}, {llvm_type}* ").__operand(pointer)
+
+    @staticmethod
+    def store(llvm_type: str, value: str, pointer: str) -> 'Instruction':
+        instruction = Instruction("store", llvm_type, None)
+        instruction.__text(f"store {llvm_type} ").__operand(value)
+        return instruction.__text(f", {llvm_type}* ").__operand(pointer)
+
+    @staticmethod
+    def element_pointer(aggregate_type: str, pointer: str, indices: list[tuple[str, str]]) -> 'Instruction':
+        instruction = Instruction("getelementptr", aggregate_type, None, ("inbounds",))
+        instruction.__text(f"getelementptr inbounds {aggregate_type}, {aggregate_type}* ").__operand(pointer)
+        for index_type, index in indices:
+            instruction.__text(f", {index_type} ").__operand(index)
+        return instruction
+
+    @staticmethod
+    def insert_value(aggregate_type: str, aggregate: str, value_type: str, value: str, index: int) -> 'Instruction':
+        instruction = Instruction("insertvalue", aggregate_type, aggregate_type)
+        instruction.__text(f"insertvalue {aggregate_type} ").__operand(aggregate)
+        return instruction.__text(f", {value_type} ").__operand(value).__text(f", {index}")
+
+    @staticmethod
+    def extract_value(aggregate_type: str, aggregate: str, index: int) -> 'Instruction':
+        instruction = Instruction("extractvalue", aggregate_type, None)
+        return instruction.__text(f"extractvalue {aggregate_type} ").__operand(aggregate).__text(f", {index}")
+
+    @staticmethod
+    def select(condition: str, llvm_type: str, if_true: str, if_false: str) -> 'Instruction':
+        instruction = Instruction("select", llvm_type, llvm_type)
+        instruction.__text("select i1 ").__operand(condition)
+        return instruction.__text(f", {llvm_type} ").__operand(if_true).__text(f", {llvm_type} ").__operand(if_false)
+
+    @staticmethod
+    def phi(llvm_type: str, incoming: list[tuple[str, str]]) -> 'Instruction':
+        instruction = Instruction("phi", llvm_type, llvm_type).__text(f"phi {llvm_type} ")
+        for i, (value, label) in enumerate(incoming):
+            instruction.__text(", [ " if i else "[ ").__operand(value).__text(", ").__label(label).__text(" ]")
+        return instruction
+
+    @staticmethod
+    def call(symbol: str, return_type: str, arguments: list[tuple[str, str]], marker: Optional[str] = None,
+             convention: Optional[str] = None) -> 'Instruction':
+        instruction = Instruction("call", return_type, None if return_type == "void" else return_type,
+                                  (marker,) if marker else ())
+        prefix = " ".join(word for word in (marker, "call", convention) if word)
+        instruction.__text(f"{prefix} {return_type} @{symbol}(")
+        for i, (argument_type, value) in enumerate(arguments):
+            instruction.__text(f", {argument_type} " if i else f"{argument_type} ").__operand(value)
+        return instruction.__text(")")
+
+    @staticmethod
+    def ret(llvm_type: str, value: Optional[str] = None) -> 'Instruction':
+        instruction = Instruction("ret", llvm_type, None)
+        if value is None:
+            return instruction.__text(f"ret {llvm_type}")
+        return instruction.__text(f"ret {llvm_type} ").__operand(value)
+
+    @staticmethod
+    def branch(label: str) -> 'Instruction':
+        return Instruction("br", None, None).__text("br label ").__label(label)
+
+    @staticmethod
+    def conditional_branch(condition: str, then_label: str, else_label: str) -> 'Instruction':
+        instruction = Instruction("br", "i1", None).__text("br i1 ").__operand(condition)
+        return instruction.__text(", label ").__label(then_label).__text(", label ").__label(else_label)
+
+    @staticmethod
+    def switch(llvm_type: str, value: str, default_label: str, cases: list[tuple[str, str]]) -> 'Instruction':
+        instruction = Instruction("switch", llvm_type, None).__text(f"switch {llvm_type} ").__operand(value)
+        instruction.__text(", label ").__label(default_label).__text(" [")
+        for literal, label in cases:
+            instruction.__text(f" {llvm_type} ").__operand(literal).__text(", label ").__label(label)
+        return instruction.__text(" ]")
+
+    def named(self, result: str) -> 'Instruction':
+        self.result = result
+        return self
+
+    def __text(self, text: str) -> 'Instruction':
+        self.tokens[-1] += text
+        return self
+
+    def __operand(self, value: str) -> 'Instruction':
+        self.operand_slots.append(len(self.tokens))
+        self.tokens += [value, ""]
+        return self
+
+    def __label(self, label: str) -> 'Instruction':
+        self.label_slots.append(len(self.tokens))
+        self.tokens += [f"%{label}", ""]
+        return self
+
+    @property
+    def operands(self) -> list[str]:
+        return [self.tokens[slot] for slot in self.operand_slots]
+
+    @property
+    def labels(self) -> list[str]:
+        return [self.tokens[slot][1:] for slot in self.label_slots]
+
+    def incoming(self) -> list[tuple[str, str]]:
+        return list(zip(self.operands, self.labels))
+
+    def is_phi(self) -> bool:
+        return self.opcode == "phi"
+
+    def is_terminator(self) -> bool:
+        return self.opcode in TERMINATOR_OPCODES
+
+    def is_unconditional_branch(self) -> bool:
+        return self.opcode == "br" and not self.operand_slots
+
+    def is_musttail_call(self) -> bool:
+        return self.opcode == "call" and MUSTTAIL_MARKER in self.flags
+
+    def replace_operand(self, old: str, new: str) -> bool:
+        slots = [slot for slot in self.operand_slots if self.tokens[slot] == old]
+        for slot in slots:
+            self.tokens[slot] = new
+        return bool(slots)
+
+    def replace_label(self, old: str, new: str):
+        for slot in self.label_slots:
+            if self.tokens[slot] == f"%{old}":
+                self.tokens[slot] = f"%{new}"
+
+    def key(self) -> str:
+        return "".join(self.tokens)
+
+    def render(self) -> str:
+        return f"  {self.result} = {self.key()}" if self.result else f"  {self.key()}"
+
+
+class BasicBlock:
+    __slots__ = ("label", "instructions")
+
+    def __init__(self, label: Optional[str], instructions: Optional[list[Instruction]] = None):
+        self.label = label
+        self.instructions = instructions if instructions is not None else []
+
+    def terminator(self) -> Instruction:
+        return self.instructions[-1]
+
+    def successors(self) -> list[str]:
+        return self.terminator().labels
+
+    def phis(self) -> list[Instruction]:
+        return [instruction for instruction in self.instructions if instruction.is_phi()]
+
+    def has_phis(self) -> bool:
+        return any(instruction.is_phi() for instruction in self.instructions)
+
+    def is_empty_jump(self) -> bool:
+        return len(self.instructions) == 1 and self.terminator().is_unconditional_branch()
+
+    def is_well_formed(self) -> bool:
+        return (bool(self.instructions) and self.terminator().is_terminator() and
+                not any(instruction.is_terminator() for instruction in self.instructions[:-1]))
+
+    def render(self) -> list[str]:
+        return ([f"{self.label}:"] if self.label else []) + [instruction.render() for instruction in self.instructions]
+
+
+class Function:
+    __slots__ = ("blocks", "uses")
+
+    def __init__(self, blocks: list[BasicBlock]):
+        malformed = next((block for block in blocks if not block.is_well_formed()), None)
+        if malformed is not None:
+            raise ValueError(f"Basic block '{malformed.label or 'entry'}' must end with exactly one terminator!")
+        self.blocks = blocks
+        self.uses: dict[str, list[Instruction]] = {}
+        for instruction in self.instructions():
+            self.__add_uses(instruction)
+
+    def instructions(self) -> Iterator[Instruction]:
+        return (instruction for block in self.blocks for instruction in block.instructions)
+
+    def block_by_label(self) -> dict[Optional[str], BasicBlock]:
+        return {block.label: block for block in self.blocks}
+
+    def predecessors(self) -> dict[str, list[Optional[str]]]:
+        predecessors: dict[str, list[Optional[str]]] = {}
+        for block in self.blocks:
+            for successor in dict.fromkeys(block.successors()):
+                predecessors.setdefault(successor, []).append(block.label)
+        return predecessors
+
+    def replace_all_uses(self, register: str, value: str):
+        for user in self.uses.pop(register, []):
+            users = self.uses.setdefault(value, []) if is_register(value) else []
+            if user.replace_operand(register, value) and user not in users:
+                users.append(user)
+
+    def replace_instruction(self, block: BasicBlock, old: Instruction, new: Instruction):
+        self.__remove_uses(old)
+        block.instructions[block.instructions.index(old)] = new
+        self.__add_uses(new)
+
+    def erase(self, block: BasicBlock, instruction: Instruction):
+        self.__remove_uses(instruction)
+        block.instructions.remove(instruction)
+
+    def render(self) -> list[str]:
+        return [line for block in self.blocks for line in block.render()]
+
+    def __add_uses(self, instruction: Instruction):
+        for operand in filter(is_register, dict.fromkeys(instruction.operands)):
+            self.uses.setdefault(operand, []).append(instruction)
+
+    def __remove_uses(self, instruction: Instruction):
+        for operand in dict.fromkeys(instruction.operands):
+            users = self.uses.get(operand, [])
+            if instruction in users:
+                users.remove(instruction)
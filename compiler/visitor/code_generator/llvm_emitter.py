@@ -1,16 +1,61 @@
 #!/usr/bin/env python3
+import io
+from typing import Optional, TextIO
+from .cfg_simplifier import CfgSimplifier
+from .ir_model import BasicBlock, Function, Instruction
+from .peephole_optimizer import PeepholeOptimizer
+from .value_numbering import ValueNumbering
+
+ENTRY_LABEL = "entry"
 
 
 class LLVMEmitter:
-    def __init__(self):
-        self.translated_lines: list[str] = []
+    def __init__(self, peephole: Optional[PeepholeOptimizer] = None, cfg_simplifier: Optional[CfgSimplifier] = None,
+                 reuse_values: bool = True, output: Optional[TextIO] = None):
+        self.peephole = peephole
+        self.cfg_simplifier = cfg_simplifier
+        self.reuse_values = reuse_values
+        self.output = output if output is not None else io.StringIO()
+        self.blocks: list[BasicBlock] = [BasicBlock(None)]
+        self.allocas: list[Instruction] = []
         self.struct_type_lines: list[str] = []
-        self.function_definitions: list[str] = []
+        self.global_lines: list[str] = []
+        self.declarations: set[str] = set()
+        self.header_written = False
         self.temp_counter = 0
         self.label_counter = 0
-
-    def emit_line(self, line: str):
-        self.translated_lines.append(line)
+        self.current_label = ENTRY_LABEL
+        self.value_numbering = ValueNumbering()
+
+    def emit_alloca(self, register: str, llvm_type: str):
+        self.allocas.append(Instruction.alloca(llvm_type).named(register))
+
+    def emit(self, instruction: Instruction):
+        self.blocks[-1].instructions.append(instruction)
+        self.value_numbering.observe(instruction)
+
+    def emit_all(self, instructions: list[Instruction]):
+        [self.emit(instruction) for instruction in instructions]
+
+    def emit_value(self, instruction: Instruction) -> str:
+        register = self.value_numbering.lookup(instruction.key()) if self.reuse_values else None
+        if register is None:
+            register = self.get_temp_register()
+            self.emit(instruction.named(register))
+            self.value_numbering.record(instruction.key(), register)
+        return register
+
+    def emit_all_before_terminator(self, instructions: list[Instruction]):
+        block = self.blocks[-1].instructions
+        if not block or not block[-1].is_terminator():
+            self.emit_all(instructions)
+            return
+
+        position = len(block) - 1
+        if position > 0 and block[position - 1].is_musttail_call():
+            position -= 1
+        block[position:position] = instructions
+        [self.value_numbering.observe(instruction) for instruction in instructions]
 
     def get_temp_register(self) -> str:
         reg = f"%_temp_{self.temp_counter}"
@@ -23,30 +68,69 @@ class LLVMEmitter:
         return label_id
 
     def emit_label(self, label: str):
-        self.translated_lines.append(f"{label}:")
+        self.blocks.append(BasicBlock(label))
+        self.current_label = label
+        self.value_numbering.clear()
+
+    def emit_loop_header(self, label: str, phis: list[Instruction]):
+        loop_body = self.blocks[0]
+        loop_body.label = label
+        loop_body.instructions[0:0] = phis
+        self.blocks.insert(0, BasicBlock(ENTRY_LABEL, self.allocas + [Instruction.branch(label)]))
+        self.allocas = []
 
     def add_struct_type_definition(self, struct_def: str):
         self.struct_type_lines.append(struct_def)
 
-    def add_function_definition(self, lines: list[str]):
-        self.function_definitions.extend(lines)
-
-    def build_final_output(self) -> str:
-        result = [self._get_print_function_llvm()]
-
-        if self.struct_type_lines:
-            result.extend(self.struct_type_lines)
-            result.append("")
+    def add_global_definition(self, global_def: str):
+        self.global_lines.append(global_def)
 
-        if self.function_definitions:
-            result.extend(self.function_definitions)
-            result.append("")
+    def declare_intrinsic(self, declaration: str):
+        if declaration not in self.declarations:
+            self.declarations.add(declaration)
+            self.global_lines.append(declaration)
 
-        result.append("define i32 @main() {")
-        result.extend(self.translated_lines)
-        result.append("}")
+    def add_function_definition(self, lines: list[str]):
+        self.__write_pending_definitions()
+        self.__write_lines(lines)
 
-        return "\n".join(result)
+    def build_final_output(self) -> str:
+        self.__write_pending_definitions()
+        self.__write_lines(["define i32 @main() {"] + self.build_function_body() + ["}"])
+        return self.output.getvalue() if isinstance(self.output, io.StringIO) else ""
+
+    def reset_module(self):
+        self.struct_type_lines = []
+        self.global_lines = []
+        self.declarations = set()
+        self.header_written = False
+
+    def __write_pending_definitions(self):
+        if not self.header_written:
+            self.output.write(self._get_print_function_llvm())
+            self.header_written = True
+        for section in (self.struct_type_lines, self.global_lines):
+            if section:
+                self.__write_lines(section + [""])
+        self.struct_type_lines = []
+        self.global_lines = []
+
+    def __write_lines(self, lines: list[str]):
+        self.output.write("\n".join(lines) + "\n")
+
+    def build_function_body(self) -> list[str]:
+        entry = self.blocks[0]
+        entry.instructions[0:0] = self.allocas
+        self.allocas = []
+        if entry.label is None and any(ENTRY_LABEL in instruction.labels
+                                       for block in self.blocks for instruction in block.phis()):
+            entry.label = ENTRY_LABEL
+        function = Function(self.blocks)
+        if self.peephole:
+            self.peephole.optimize(function)
+        if self.cfg_simplifier:
+            self.cfg_simplifier.simplify(function)
+        return function.render()
 
     @staticmethod
     def _get_print_function_llvm() -> str:
@@ -62,19 +146,31 @@ define void @printResult(i32 %val) {
 
 """
 
+    def reset_body(self):
+        self.blocks = [BasicBlock(None)]
+        self.allocas = []
+
     def reset_for_function(self):
-        self.translated_lines = []
+        self.reset_body()
         self.temp_counter = 0
         self.label_counter = 0
+        self.current_label = ENTRY_LABEL
+        self.value_numbering = ValueNumbering()
 
     def copy_state(self) -> dict:
         return {
-            'translated_lines': self.translated_lines,
+            'blocks': self.blocks,
+            'allocas': self.allocas,
             'temp_counter': self.temp_counter,
-            'label_counter': self.label_counter
+            'label_counter': self.label_counter,
+            'current_label': self.current_label,
+            'value_numbering': self.value_numbering
         }
 
     def restore_state(self, state: dict):
-        self.translated_lines = state['translated_lines']
+        self.blocks = state['blocks']
+        self.allocas = state['allocas']
         self.temp_counter = state['temp_counter']
-        self.label_counter = state['label_counter']
\ No newline at end of file
+        self.label_counter = state['label_counter']
+        self.current_label = state['current_label']
+        self.value_numbering = state['value_numbering']
\ No newline at end of file
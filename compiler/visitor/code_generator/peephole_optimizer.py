@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+from typing import Callable, Optional
+from .ir_model import Function, Instruction
+
+BOOLEAN_VALUES = {"true": 1, "1": 1, "false": 0, "0": 0}
+DROP = ""
+
+
+class PeepholeContext:
+    def __init__(self):
+        self.definitions: dict[str, Instruction] = {}
+        self.memory: dict[str, str] = {}
+
+    def enter_block(self):
+        self.memory = {}
+
+    def observe(self, instruction: Instruction):
+        if instruction.result:
+            self.definitions[instruction.result] = instruction
+
+        if instruction.opcode == "load" and instruction.operands:
+            self.memory[instruction.operands[-1]] = instruction.result
+        elif _is_pointer_store(instruction):
+            self.memory = {instruction.operands[1]: instruction.operands[0]}
+        elif instruction.opcode in ("store", "call"):
+            self.memory = {}
+
+    def definition(self, value: str, opcode: str) -> Optional[Instruction]:
+        instruction = self.definitions.get(value)
+        return instruction if instruction and instruction.opcode == opcode else None
+
+
+class PeepholePattern:
+    def __init__(self, name: str, opcode: str, rewrite: Callable[[Instruction, PeepholeContext], Optional[str]]):
+        self.name = name
+        self.opcode = opcode
+        self.rewrite = rewrite
+
+    def apply(self, instruction: Instruction, context: PeepholeContext) -> Optional[str]:
+        return self.rewrite(instruction, context) if instruction.opcode == self.opcode else None
+
+
+def _is_pointer_store(instruction: Instruction) -> bool:
+    return instruction.opcode == "store" and len(instruction.operands) == 2
+
+
+def _is_integer(value: str) -> bool:
+    return value.lstrip("-").isdigit()
+
+
+def _truncate(value: int, bits: int) -> int:
+    value &= (1 << bits) - 1
+    return value - (1 << bits) if value >= 1 << (bits - 1) else value
+
+
+def _fold_sext(instruction: Instruction, _) -> Optional[str]:
+    value = instruction.operands[0]
+    return value if instruction.type == "i32" and instruction.result_type == "i64" and _is_integer(value) else None
+
+
+def _fold_zext(instruction: Instruction, _) -> Optional[str]:
+    value = instruction.operands[0]
+    return str(BOOLEAN_VALUES[value]) if instruction.type == "i1" and value in BOOLEAN_VALUES else None
+
+
+def _fold_trunc(instruction: Instruction, _) -> Optional[str]:
+    value = instruction.operands[0]
+    if instruction.type != "i64" or instruction.result_type != "i32" or not _is_integer(value):
+        return None
+    return str(_truncate(int(value), 32))
+
+
+def _fold_xor(instruction: Instruction, _) -> Optional[str]:
+    left, right = instruction.operands
+    if instruction.type != "i1" or left not in BOOLEAN_VALUES or right not in BOOLEAN_VALUES:
+        return None
+    return str(BOOLEAN_VALUES[left] ^ BOOLEAN_VALUES[right])
+
+
+def _cancel_negation(instruction: Instruction, context: PeepholeContext) -> Optional[str]:
+    left, right = instruction.operands
+    inner = context.definition(left, "xor")
+    if instruction.type != "i1" or BOOLEAN_VALUES.get(right) != 1 or inner is None:
+        return None
+    inner_left, inner_right = inner.operands
+    return inner_left if BOOLEAN_VALUES.get(inner_right) == 1 else None
+
+
+def _cancel_extension(instruction: Instruction, context: PeepholeContext) -> Optional[str]:
+    value = instruction.operands[0]
+    extension = context.definition(value, "sext") or context.definition(value, "zext")
+    return extension.operands[0] if extension and extension.type == instruction.result_type else None
+
+
+def _drop_redundant_store(instruction: Instruction, context: PeepholeContext) -> Optional[str]:
+    if not _is_pointer_store(instruction):
+        return None
+    value, pointer = instruction.operands
+    return DROP if context.memory.get(pointer) == value else None
+
+
+PEEPHOLE_PATTERNS = [
+    PeepholePattern("sext_constant", "sext", _fold_sext),
+    PeepholePattern("zext_constant", "zext", _fold_zext),
+    PeepholePattern("trunc_constant", "trunc", _fold_trunc),
+    PeepholePattern("xor_constant", "xor", _fold_xor),
+    PeepholePattern("double_negation", "xor", _cancel_negation),
+    PeepholePattern("cast_round_trip", "trunc", _cancel_extension),
+    PeepholePattern("redundant_store", "store", _drop_redundant_store),
+]
+
+
+class PeepholeOptimizer:
+    def __init__(self, patterns: Optional[list[PeepholePattern]] = None):
+        self.patterns = PEEPHOLE_PATTERNS if patterns is None else patterns
+        self.hit_counts: dict[str, int] = {}
+
+    def optimize(self, function: Function):
+        changed = bool(self.patterns)
+        while changed:
+            changed = self.__rewrite_once(function)
+
+    def __rewrite_once(self, function: Function) -> bool:
+        context = PeepholeContext()
+        changed = False
+        for block in function.blocks:
+            context.enter_block()
+            for instruction in list(block.instructions):
+                replacement = self.__match(instruction, context)
+                if replacement is None:
+                    context.observe(instruction)
+                    continue
+
+                function.erase(block, instruction)
+                if instruction.result:
+                    function.replace_all_uses(instruction.result, replacement)
+                changed = True
+        return changed
+
+    def __match(self, instruction: Instruction, context: PeepholeContext) -> Optional[str]:
+        for pattern in self.patterns:
+            replacement = pattern.apply(instruction, context)
+            if replacement is not None:
+                self.hit_counts[pattern.name] = self.hit_counts.get(pattern.name, 0) + 1
+                return replacement
+        return None
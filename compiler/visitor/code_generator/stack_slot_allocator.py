@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+from .ir_model import Instruction
+
+LIFETIME_START = "llvm.lifetime.start.p0i8"
+LIFETIME_END = "llvm.lifetime.end.p0i8"
+
+
+class StackSlotAllocator:
+    def __init__(self, emitter, struct_ops, share_slots: bool = True):
+        self.emitter = emitter
+        self.struct_ops = struct_ops
+        self.share_slots = share_slots
+        self.free_slots: dict[str, list[str]] = {}
+        self.temporaries: list[tuple[str, str]] = []
+        self.scopes: list[list[tuple[str, str]]] = []
+
+    def allocate_temporary(self, struct_name: str) -> str:
+        free_slots = self.free_slots.get(struct_name)
+        if free_slots:
+            slot = free_slots.pop()
+        else:
+            slot = self.emitter.get_temp_register()
+            self.emitter.emit_alloca(slot, f"%struct.{struct_name}")
+
+        if self.share_slots:
+            self.emitter.emit_all(self.__build_lifetime_marker(LIFETIME_START, struct_name, slot))
+            self.temporaries.append((slot, struct_name))
+        return slot
+
+    def allocate_variable(self, register: str, struct_name: str):
+        self.emitter.emit_alloca(register, f"%struct.{struct_name}")
+        if not self.share_slots:
+            return
+        self.emitter.emit_all(self.__build_lifetime_marker(LIFETIME_START, struct_name, register))
+        if self.scopes:
+            self.scopes[-1].append((register, struct_name))
+
+    def begin_statement(self) -> int:
+        return len(self.temporaries)
+
+    def end_statement(self, mark: int):
+        released = self.temporaries[mark:]
+        del self.temporaries[mark:]
+        self.__release(released)
+
+    def begin_scope(self):
+        self.scopes.append([])
+
+    def end_scope(self):
+        self.__release(self.scopes.pop())
+
+    def __release(self, slots: list[tuple[str, str]]):
+        for slot, struct_name in reversed(slots):
+            self.emitter.emit_all_before_terminator(self.__build_lifetime_marker(LIFETIME_END, struct_name, slot))
+            self.free_slots.setdefault(struct_name, []).append(slot)
+
+    def __build_lifetime_marker(self, intrinsic: str, struct_name: str, slot: str) -> list[Instruction]:
+        self.emitter.declare_intrinsic(f"declare void @{intrinsic}(i64, i8* nocapture)")
+        size, _ = self.struct_ops.get_struct_layout(struct_name)
+        byte_ptr = self.emitter.get_temp_register()
+        return [Instruction.cast("bitcast", slot, f"%struct.{struct_name}*", "i8*").named(byte_ptr),
+                Instruction.call(intrinsic, "void", [("i64", str(size)), ("i8*", byte_ptr)])]
+
+    def copy_state(self) -> dict:
+        return {
+            'free_slots': self.free_slots,
+            'temporaries': self.temporaries,
+            'scopes': self.scopes
+        }
+
+    def restore_state(self, state: dict):
+        self.free_slots = state['free_slots']
+        self.temporaries = state['temporaries']
+        self.scopes = state['scopes']
+
+    def reset(self):
+        self.free_slots = {}
+        self.temporaries = []
+        self.scopes = []
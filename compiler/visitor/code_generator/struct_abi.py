@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+from ...llvm_specifics.data_type import DataType
+from ...llvm_specifics.memory_effect import MemoryEffect
+from ..analysis.tail_call_analyzer import TailCallAnalyzer
+
+POINTER_ABI = "pointer"
+REGISTER_ABI = "registers"
+MAX_REGISTER_STRUCT_SIZE = 16
+
+
+class StructAbi:
+    def __init__(self, struct_ops, inliner, mode: str = POINTER_ABI):
+        self.struct_ops = struct_ops
+        self.inliner = inliner
+        self.mode = mode
+        self.side_effects = None
+        self.scalar_param_cache: dict[str, set[str]] = {}
+
+    def configure(self, side_effects):
+        self.side_effects = side_effects
+        self.scalar_param_cache = {}
+
+    def is_scalar_param(self, func_name: str, param_name: str) -> bool:
+        if func_name not in self.scalar_param_cache:
+            self.scalar_param_cache[func_name] = self.__select_scalar_params(func_name)
+        return param_name in self.scalar_param_cache[func_name]
+
+    def needs_struct_view(self, func_name: str, param_name: str) -> bool:
+        if param_name in self.side_effects.address_taken.get(func_name, set()):
+            return True
+        return any(not self.__passes_as_scalars(callee, index)
+                   for callee, index in self.side_effects.struct_arguments.get(func_name, {}).get(param_name, set()))
+
+    def get_scalar_fields(self, struct_name: str) -> list[tuple[str, str]]:
+        return [(field_name, field_llvm_type)
+                for field_name, field_llvm_type, _ in self.struct_ops.struct_definitions[struct_name]]
+
+    def __passes_as_scalars(self, callee: str, index: int) -> bool:
+        node = self.inliner.function_nodes.get(callee)
+        if node is None or not 0 <= index < len(node.params) or self.inliner.is_candidate(callee):
+            return False
+        return self.is_scalar_param(callee, node.params[index].name)
+
+    def __select_scalar_params(self, func_name: str) -> set[str]:
+        node = self.inliner.function_nodes.get(func_name)
+        if self.mode != REGISTER_ABI or node is None:
+            return set()
+        if TailCallAnalyzer(node.variable).analyze(node).can_lower_to_loop():
+            return set()
+
+        struct_arguments = self.side_effects.struct_arguments.get(func_name, {})
+        return {param.name for param in node.params
+                if self.__is_register_passable(param.param_type) and
+                all(self.side_effects.get_argument_effect(callee) != MemoryEffect.WRITES
+                    for callee, _ in struct_arguments.get(param.name, set()))}
+
+    def __is_register_passable(self, type_name: str) -> bool:
+        if DataType.is_data_type(type_name) or type_name not in self.struct_ops.struct_definitions:
+            return False
+        fields = self.struct_ops.struct_definitions[type_name]
+        return (all(DataType.is_data_type(field_data_type) for _, _, field_data_type in fields) and
+                self.struct_ops.get_struct_layout(type_name)[0] <= MAX_REGISTER_STRUCT_SIZE)
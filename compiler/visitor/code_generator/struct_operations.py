@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
+from typing import Optional
+from ..optimizer.constant_folder import ConstantFolder
 from ...llvm_specifics.data_type import DataType
+from ...node.struct_init_node import StructInitNode
+from .ir_model import Instruction
+
+MAX_AGGREGATE_COPY_SIZE = 32
+MEMCPY_INTRINSIC = "llvm.memcpy.p0i8.p0i8.i64"
 
 
 class StructOperations:
-    def __init__(self, emitter, variable_registry, type_converter):
+    def __init__(self, emitter, variable_registry, type_converter, use_constant_globals: bool = True):
         self.emitter = emitter
         self.variable_registry = variable_registry
         self.type_converter = type_converter
+        self.use_constant_globals = use_constant_globals
         self.struct_definitions: dict[str, list[tuple[str, str, str]]] = {}
+        self.constant_globals: dict[str, str] = {}
 
     def build_struct_fields(self, node) -> list[tuple[str, str, str]]:
         fields = []
@@ -22,33 +31,54 @@ class StructOperations:
         struct_def = f"%struct.{struct_name} = type {{ {', '.join(field_types)} }}"
         self.emitter.add_struct_type_definition(struct_def)
 
-    def allocate_struct(self, struct_name: str) -> str:
-        struct_reg = self.emitter.get_temp_register()
-        self.emitter.emit_line(f"  {struct_reg} = alloca %struct.{struct_name}")
-        return struct_reg
-
     def initialize_struct_fields(self, node, struct_reg: str, visitor):
-        fields = self.struct_definitions[node.struct_type]
+        constant_global = self.get_constant_global(node, visitor)
+        if constant_global:
+            self.copy_struct(node.struct_type, constant_global, struct_reg)
+            return
 
+        fields = self.struct_definitions[node.struct_type]
         for i, (field_name, field_llvm_type, field_data_type) in enumerate(fields):
+            if not DataType.is_data_type(field_data_type):
+                field_ptr = self.get_struct_field_ptr(node.struct_type, struct_reg, i)
+                visitor.func_gen.construct_struct_into(field_ptr, field_data_type, node.init_expressions[i], visitor)
+                continue
+
             expr_value = node.init_expressions[i].accept(visitor)
             expr_type = self.type_converter.get_node_type(node.init_expressions[i])
 
             field_ptr = self.get_struct_field_ptr(node.struct_type, struct_reg, i)
-
-            if isinstance(expr_type, str):
-                self.copy_struct_fields(field_data_type, expr_value, field_ptr)
-            else:
-                expr_value = self.convert_type_if_needed(expr_value, expr_type, field_data_type)
-                self.emitter.emit_line(f"  store {field_llvm_type} {expr_value}, {field_llvm_type}* {field_ptr}")
+            expr_value = self.convert_type_if_needed(expr_value, expr_type, field_data_type)
+            self.emitter.emit(Instruction.store(field_llvm_type, expr_value, field_ptr))
+
+    def get_constant_global(self, node, visitor) -> Optional[str]:
+        if not self.use_constant_globals or not self.is_constant_initializer(node):
+            return None
+        constant = f"%struct.{node.struct_type} {self.__build_constant(node, visitor)}"
+        if constant not in self.constant_globals:
+            global_name = f"@const.{node.struct_type}.{len(self.constant_globals)}"
+            _, alignment = self.get_struct_layout(node.struct_type)
+            self.emitter.add_global_definition(
+                f"{global_name} = private unnamed_addr constant {constant}, align {alignment}")
+            self.constant_globals[constant] = global_name
+        return self.constant_globals[constant]
+
+    def is_constant_initializer(self, node) -> bool:
+        return isinstance(node, StructInitNode) and all(
+            ConstantFolder.is_literal(expr) or self.is_constant_initializer(expr) for expr in node.init_expressions)
+
+    def __build_constant(self, node, visitor) -> str:
+        values = []
+        for (_, field_llvm_type, field_data_type), expr in zip(self.struct_definitions[node.struct_type],
+                                                               node.init_expressions):
+            value = expr.accept(visitor) if DataType.is_data_type(field_data_type) \
+                else self.__build_constant(expr, visitor)
+            values.append(f"{field_llvm_type} {value}")
+        return f"{{ {', '.join(values)} }}"
 
     def get_struct_field_ptr(self, struct_name: str, struct_ptr: str, field_index: int) -> str:
-        field_ptr = self.emitter.get_temp_register()
-        self.emitter.emit_line(
-            f"  {field_ptr} = getelementptr inbounds %struct.{struct_name}, "
-            f"%struct.{struct_name}* {struct_ptr}, i32 0, i32 {field_index}"
-        )
-        return field_ptr
+        return self.emitter.emit_value(Instruction.element_pointer(
+            f"%struct.{struct_name}", struct_ptr, [("i32", "0"), ("i32", str(field_index))]))
 
     def convert_type_if_needed(self, value: str, expr_type, target_type: str) -> str:
         if isinstance(expr_type, DataType) and DataType.is_data_type(target_type):
@@ -58,9 +88,7 @@ class StructOperations:
         return value
 
     def widen_to_i64(self, value: str) -> str:
-        temp_reg = self.emitter.get_temp_register()
-        self.emitter.emit_line(f"  {temp_reg} = sext i32 {value} to i64")
-        return temp_reg
+        return self.emitter.emit_value(Instruction.cast("sext", value, "i32", "i64"))
 
     def access_field(self, field_name: str, current_type, current_reg: str, is_final: bool):
         if not isinstance(current_type, str):
@@ -68,10 +96,8 @@ class StructOperations:
 
         field_ptr, field_llvm_type, field_data_type = self.__get_field_info(current_type, field_name, current_reg)
 
-        if is_final:
-            value_reg = self.emitter.get_temp_register()
-            self.emitter.emit_line(f"  {value_reg} = load {field_llvm_type}, {field_llvm_type}* {field_ptr}")
-            current_reg = value_reg
+        if is_final and DataType.is_data_type(field_data_type):
+            current_reg = self.load_value(field_llvm_type, field_ptr)
         else:
             current_reg = field_ptr
 
@@ -91,19 +117,41 @@ class StructOperations:
                 return i, field_type, fdata
         raise ValueError(f"Field {field_name} not found")
 
-    def copy_struct_fields(self, struct_name: str, src_ptr: str, dst_ptr: str):
-        fields = self.struct_definitions[struct_name]
-        for i, (field_name, field_llvm_type, _) in enumerate(fields):
-            src_field_ptr = self.get_struct_field_ptr(struct_name, src_ptr, i)
-            src_val = self.load_value(field_llvm_type, src_field_ptr)
-
-            dst_field_ptr = self.get_struct_field_ptr(struct_name, dst_ptr, i)
-            self.emitter.emit_line(f"  store {field_llvm_type} {src_val}, {field_llvm_type}* {dst_field_ptr}")
+    def copy_struct(self, struct_name: str, src_ptr: str, dst_ptr: str):
+        size, alignment = self.get_struct_layout(struct_name)
+        if size <= MAX_AGGREGATE_COPY_SIZE:
+            struct_type = f"%struct.{struct_name}"
+            src_val = self.load_value(struct_type, src_ptr)
+            self.emitter.emit(Instruction.store(struct_type, src_val, dst_ptr))
+        else:
+            self.__emit_memcpy(struct_name, src_ptr, dst_ptr, size, alignment)
+
+    def __emit_memcpy(self, struct_name: str, src_ptr: str, dst_ptr: str, size: int, alignment: int):
+        self.emitter.declare_intrinsic(f"declare void @{MEMCPY_INTRINSIC}(i8*, i8*, i64, i1)")
+        src_bytes = self.__cast_to_bytes(struct_name, src_ptr)
+        dst_bytes = self.__cast_to_bytes(struct_name, dst_ptr)
+        self.emitter.emit(Instruction.call(MEMCPY_INTRINSIC, "void", [
+            (f"i8* align {alignment}", dst_bytes), (f"i8* align {alignment}", src_bytes),
+            ("i64", str(size)), ("i1", "false")]))
+
+    def __cast_to_bytes(self, struct_name: str, ptr: str) -> str:
+        byte_ptr = self.emitter.get_temp_register()
+        self.emitter.emit(Instruction.cast("bitcast", ptr, f"%struct.{struct_name}*", "i8*").named(byte_ptr))
+        return byte_ptr
+
+    def get_struct_layout(self, struct_name: str) -> tuple[int, int]:
+        size, alignment = 0, 1
+        for _, _, field_data_type in self.struct_definitions[struct_name]:
+            field_size, field_alignment = (
+                (DataType.from_string(field_data_type).size_in_bytes,) * 2
+                if DataType.is_data_type(field_data_type)
+                else self.get_struct_layout(field_data_type))
+            size = -(-size // field_alignment) * field_alignment + field_size
+            alignment = max(alignment, field_alignment)
+        return -(-size // alignment) * alignment, alignment
 
     def load_value(self, llvm_type: str, ptr: str) -> str:
-        val_reg = self.emitter.get_temp_register()
-        self.emitter.emit_line(f"  {val_reg} = load {llvm_type}, {llvm_type}* {ptr}")
-        return val_reg
+        return self.emitter.emit_value(Instruction.load(llvm_type, ptr))
 
     def get_object_pointer_from_chain(self, object_chain: list[str]) -> str:
         if not object_chain:
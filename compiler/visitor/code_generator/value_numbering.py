@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+from typing import Optional
+from .ir_model import Instruction
+
+LOAD_PREFIX = "load "
+
+
+class ValueNumbering:
+    def __init__(self):
+        self.values: dict[str, str] = {}
+
+    def lookup(self, expression: str) -> Optional[str]:
+        return self.values.get(expression)
+
+    def record(self, expression: str, register: str):
+        self.values[expression] = register
+
+    def observe(self, instruction: Instruction):
+        if instruction.opcode == "store":
+            self.invalidate_memory()
+            value, pointer = instruction.operands
+            self.record(Instruction.load(instruction.type, pointer).key(), value)
+        elif instruction.opcode == "call":
+            self.invalidate_memory()
+
+    def invalidate_memory(self):
+        self.values = {expression: register for expression, register in self.values.items()
+                       if not expression.startswith(LOAD_PREFIX)}
+
+    def clear(self):
+        self.values = {}
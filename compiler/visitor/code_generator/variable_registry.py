@@ -8,6 +8,7 @@ class VariableRegistry:
         self.variable_versions: dict[str, int] = {}
         self.variable_types: dict[str, Union[DataType, str]] = {}
         self.max_versions: dict[str, int] = {}
+        self.scalar_fields: dict[str, dict[str, str]] = {}
 
     def get_variable_register(self, variable: str) -> str:
         if variable not in self.max_versions:
@@ -19,10 +20,17 @@ class VariableRegistry:
         self.variable_versions[variable] = self.max_versions[variable]
         return f"%{variable}.{self.variable_versions[variable]}"
 
+    def reserve_register(self, variable: str) -> tuple[str, int]:
+        version = self.max_versions[variable] + 1 if variable in self.max_versions else 0
+        self.max_versions[variable] = version
+        return (f"%{variable}.{version}" if version else f"%{variable}"), version
+
     def get_current_register(self, variable: str) -> str:
-        if variable not in self.variable_versions or self.variable_versions[variable] == 0:
-            return f"%{variable}"
-        return f"%{variable}.{self.variable_versions[variable]}"
+        return self.get_version_register(variable, self.variable_versions.get(variable, 0))
+
+    @staticmethod
+    def get_version_register(variable: str, version: int) -> str:
+        return f"%{variable}.{version}" if version else f"%{variable}"
 
     def get_variable_type(self, variable: str) -> Optional[Union[DataType, str]]:
         return self.variable_types.get(variable)
@@ -36,6 +44,12 @@ class VariableRegistry:
     def get_variable_version(self, variable: str) -> Optional[int]:
         return self.variable_versions.get(variable)
 
+    def set_scalar_fields(self, variable: str, fields: dict[str, str]):
+        self.scalar_fields[self.get_current_register(variable)] = fields
+
+    def get_scalar_fields(self, variable: str) -> Optional[dict[str, str]]:
+        return self.scalar_fields.get(self.get_current_register(variable))
+
     def is_field_access_from_this(self, variable: str) -> bool:
         return self.variable_versions.get(variable) == -1
 
@@ -43,19 +57,21 @@ class VariableRegistry:
         return {
             'versions': self.variable_versions.copy(),
             'types': self.variable_types.copy(),
-            'max_versions': self.max_versions.copy()
+            'max_versions': self.max_versions.copy(),
+            'scalar_fields': self.scalar_fields.copy()
         }
 
     def restore_state(self, state: dict):
-        for var in state['versions']:
-            if var in self.max_versions and var in state['max_versions']:
-                state['max_versions'][var] = max(self.max_versions[var], state['max_versions'][var])
-        
+        for var, max_version in self.max_versions.items():
+            state['max_versions'][var] = max(max_version, state['max_versions'].get(var, max_version))
+
         self.variable_versions = state['versions']
         self.variable_types = state['types']
         self.max_versions = state['max_versions']
+        self.scalar_fields = state['scalar_fields']
 
     def reset(self):
         self.variable_versions = {}
         self.variable_types = {}
-        self.max_versions = {}
\ No newline at end of file
+        self.max_versions = {}
+        self.scalar_fields = {}
\ No newline at end of file
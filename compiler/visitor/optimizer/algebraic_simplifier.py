@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+from typing import Optional, Union
+from ..ast_visitor import ASTVisitor
+from .constant_folder import ConstantFolder
+from ...constants import NOT
+from ...llvm_specifics.boolean import Boolean
+from ...llvm_specifics.data_type import DataType
+from ...llvm_specifics.operator import Operator
+from ...node.assign_node import AssignNode
+from ...node.binary_op_node import BinaryOpNode
+from ...node.bool_node import BooleanNode
+from ...node.function_call_node import FunctionCallNode
+from ...node.id_node import IDNode
+from ...node.number_node import NumberNode
+from ...node.struct_field_node import StructFieldNode
+from ...node.unary_op_node import UnaryOpNode
+
+NodeType = Optional[Union[DataType, str]]
+MAX_SHIFT = {DataType.I32: 30, DataType.I64: 62}
+
+
+class AlgebraicSimplifier(ASTVisitor):
+    def __init__(self):
+        self.scopes: list[dict[str, NodeType]] = [{}]
+        self.struct_fields: dict[str, dict[str, NodeType]] = {}
+        self.return_types: dict[str, NodeType] = {}
+        self.rule_counts: dict[str, int] = {}
+
+    @staticmethod
+    def to_node_type(type_name) -> NodeType:
+        if isinstance(type_name, DataType) or not DataType.is_data_type(type_name):
+            return type_name
+        return DataType.from_string(type_name)
+
+    def visit_program(self, node):
+        self.declare_signatures(node.struct_decls, node.func_decls)
+        [decl.accept(self) for decl in node.struct_decls + node.func_decls]
+        self.__simplify_statements(node.statement_nodes)
+        if node.return_node:
+            node.return_node.accept(self)
+
+    def declare_signatures(self, struct_decls: list, func_decls: list):
+        self.struct_fields.update({struct_decl.variable: {field.variable: self.to_node_type(field.data_type)
+                                                          for field in struct_decl.fields}
+                                   for struct_decl in struct_decls})
+        self.return_types.update({func_decl.variable: self.to_node_type(func_decl.return_type)
+                                  for func_decl in func_decls})
+
+    def visit_struct_declaration(self, node):
+        self.scopes.append(dict(self.struct_fields[node.variable]))
+        [member_func.accept(self) for member_func in node.member_functions]
+        self.scopes.pop()
+
+    def visit_function_declaration(self, node):
+        self.scopes.append({param.name: self.to_node_type(param.param_type) for param in node.params})
+        node.body.accept(self)
+        self.scopes.pop()
+
+    def visit_code_block(self, node):
+        self.scopes.append({})
+        self.__simplify_statements(node.statements)
+        if node.return_node:
+            node.return_node.accept(self)
+        self.scopes.pop()
+
+    def visit_declaration(self, node):
+        node.expr_node = node.expr_node.accept(self)
+        self.scopes[-1][node.variable] = self.to_node_type(node.data_type)
+
+    def visit_assignment(self, node):
+        node.expr_node = node.expr_node.accept(self)
+
+    def visit_struct_field_assignment(self, node):
+        node.expr_node = node.expr_node.accept(self)
+
+    def visit_return(self, node):
+        node.expr_node = node.expr_node.accept(self)
+
+    def visit_if_statement(self, node):
+        node.condition = node.condition.accept(self)
+        node.expr_node = node.condition
+        node.then_block.accept(self)
+        if node.else_block:
+            node.else_block.accept(self)
+
+    def visit_id(self, node):
+        return node
+
+    def visit_number(self, node):
+        return node
+
+    def visit_boolean(self, node):
+        return node
+
+    def visit_struct_field(self, node):
+        return node
+
+    def visit_struct_initialization(self, node):
+        node.init_expressions = [expr.accept(self) for expr in node.init_expressions]
+        return node
+
+    def visit_function_call(self, node):
+        node.arguments = [arg.accept(self) for arg in node.arguments]
+        return node
+
+    def visit_unary_operation(self, node):
+        node.operand = node.operand.accept(self)
+        if node.operator == NOT and isinstance(node.operand, UnaryOpNode) and node.operand.operator == NOT:
+            return self.__rewrite("double_negation", node.operand.operand)
+        return node
+
+    def visit_binary_operation(self, node):
+        node.left = node.left.accept(self)
+        node.right = node.right.accept(self)
+        simplified = (self.__simplify_comparison(node) if node.operator.is_for_comparison()
+                      else self.__simplify_arithmetic(node))
+        return simplified if simplified is not None else node
+
+    def __simplify_comparison(self, node: BinaryOpNode):
+        if self.__is_pure(node) and self.__same_expression(node.left, node.right):
+            return self.__rewrite("compare_self", self.__boolean(node.operator == Operator.EQUALS))
+
+        for operand, other in ((node.left, node.right), (node.right, node.left)):
+            if isinstance(other, BooleanNode) and self.__type_of(operand) == DataType.BOOL:
+                keeps_operand = (Boolean.from_string(other.value) == Boolean.TRUE) == (node.operator == Operator.EQUALS)
+                return self.__rewrite("compare_boolean_literal",
+                                      operand if keeps_operand else UnaryOpNode(NOT, operand))
+        return None
+
+    def __simplify_arithmetic(self, node: BinaryOpNode):
+        result_type = node.result_type if node.result_type else DataType.I32
+        left, right = self.__integer_value(node.left), self.__integer_value(node.right)
+
+        if node.operator == Operator.PLUS and (left == 0 or right == 0):
+            return self.__rewrite_to_operand("add_zero", node.right if left == 0 else node.left, result_type)
+        if node.operator == Operator.MINUS and right == 0:
+            return self.__rewrite_to_operand("sub_zero", node.left, result_type)
+        if node.operator == Operator.MINUS and self.__is_pure(node) and self.__same_expression(node.left, node.right):
+            return self.__rewrite_to_operand("sub_self", NumberNode("0"), result_type)
+        if node.operator != Operator.MULTIPLY:
+            return None
+
+        if (left == 0 or right == 0) and self.__is_pure(node):
+            return self.__rewrite_to_operand("mul_zero", NumberNode("0"), result_type)
+        if left == 1 or right == 1:
+            return self.__rewrite_to_operand("mul_one", node.right if left == 1 else node.left, result_type)
+        for operand, constant in ((node.left, right), (node.right, left)):
+            if (constant and constant > 1 and constant & (constant - 1) == 0
+                    and not ConstantFolder.is_literal(operand)):
+                shift = constant.bit_length() - 1
+                if shift <= MAX_SHIFT.get(result_type, 0):
+                    shifted = BinaryOpNode(operand, Operator.SHIFT_LEFT, NumberNode(str(shift)))
+                    shifted.result_type = node.result_type
+                    return self.__rewrite("mul_power_of_two_to_shift", shifted)
+        return None
+
+    def __simplify_statements(self, statements: list):
+        [stmt.accept(self) for stmt in statements]
+        statements[:] = [stmt for stmt in statements if not self.__is_self_assignment(stmt)]
+
+    def __is_self_assignment(self, stmt) -> bool:
+        if isinstance(stmt, AssignNode) and isinstance(stmt.expr_node, IDNode) and stmt.expr_node.value == stmt.variable:
+            return self.__rewrite("self_assignment", True)
+        return False
+
+    def __rewrite_to_operand(self, rule: str, operand, result_type: DataType):
+        return self.__rewrite(rule, operand) if self.__type_of(operand) == result_type else None
+
+    def __rewrite(self, rule: str, replacement):
+        self.rule_counts[rule] = self.rule_counts.get(rule, 0) + 1
+        return replacement
+
+    @staticmethod
+    def __integer_value(node) -> Optional[int]:
+        return int(node.value) if isinstance(node, NumberNode) else None
+
+    @staticmethod
+    def __boolean(value: bool) -> BooleanNode:
+        return BooleanNode(str(Boolean.TRUE if value else Boolean.FALSE))
+
+    def __is_pure(self, node) -> bool:
+        if isinstance(node, FunctionCallNode):
+            return False
+        if isinstance(node, BinaryOpNode):
+            return self.__is_pure(node.left) and self.__is_pure(node.right)
+        if isinstance(node, UnaryOpNode):
+            return self.__is_pure(node.operand)
+        return isinstance(node, (IDNode, NumberNode, BooleanNode, StructFieldNode))
+
+    def __same_expression(self, left, right) -> bool:
+        if type(left) is not type(right):
+            return False
+        if isinstance(left, NumberNode):
+            return int(left.value) == int(right.value)
+        if isinstance(left, (IDNode, BooleanNode)):
+            return left.value == right.value
+        if isinstance(left, StructFieldNode):
+            return left.field_chain.fields == right.field_chain.fields
+        if isinstance(left, UnaryOpNode):
+            return left.operator == right.operator and self.__same_expression(left.operand, right.operand)
+        if isinstance(left, BinaryOpNode):
+            return (left.operator == right.operator and self.__same_expression(left.left, right.left)
+                    and self.__same_expression(left.right, right.right))
+        return False
+
+    def __type_of(self, node) -> NodeType:
+        if ConstantFolder.is_literal(node):
+            return ConstantFolder.literal_type(node)
+        if isinstance(node, IDNode):
+            return self.__lookup(node.value)
+        if isinstance(node, StructFieldNode):
+            current_type = self.__lookup(node.field_chain.fields[0])
+            for field_name in node.field_chain.fields[1:]:
+                current_type = self.struct_fields.get(current_type, {}).get(field_name)
+            return current_type
+        if isinstance(node, BinaryOpNode):
+            if node.operator.is_for_comparison():
+                return DataType.BOOL
+            return node.result_type if node.result_type else DataType.I32
+        if isinstance(node, UnaryOpNode):
+            return DataType.BOOL
+        if isinstance(node, FunctionCallNode) and not node.field_chain:
+            return self.return_types.get(node.value)
+        return None
+
+    def __lookup(self, name: str) -> NodeType:
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
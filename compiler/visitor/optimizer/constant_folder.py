@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+from typing import Optional, Union
+from ..ast_visitor import ASTVisitor
+from ...constants import NOT, I32_MIN, I32_MAX, I64_MIN, I64_MAX
+from ...llvm_specifics.boolean import Boolean
+from ...llvm_specifics.data_type import DataType
+from ...llvm_specifics.operator import Operator
+from ...node.number_node import NumberNode
+from ...node.bool_node import BooleanNode
+
+Literal = Union[NumberNode, BooleanNode]
+
+
+class ConstantFolder(ASTVisitor):
+    def __init__(self):
+        self.scopes: list[dict[str, Optional[Literal]]] = [{}]
+        self.folded_count = 0
+
+    @staticmethod
+    def is_literal(node) -> bool:
+        return isinstance(node, (NumberNode, BooleanNode))
+
+    @staticmethod
+    def literal_type(node: Literal) -> DataType:
+        if isinstance(node, BooleanNode):
+            return DataType.BOOL
+        value = int(node.value)
+        return DataType.I32 if I32_MIN <= value <= I32_MAX else DataType.I64
+
+    @staticmethod
+    def literal_to_string(node: Literal) -> str:
+        return node.value if isinstance(node, BooleanNode) else str(int(node.value))
+
+    @staticmethod
+    def literal_from_string(value: str) -> Literal:
+        return BooleanNode(value) if value in (str(Boolean.TRUE), str(Boolean.FALSE)) else NumberNode(value)
+
+    @staticmethod
+    def wrap_integer(value: int, data_type: DataType) -> int:
+        low, high = (I64_MIN, I64_MAX) if data_type == DataType.I64 else (I32_MIN, I32_MAX)
+        span = high - low + 1
+        return (value - low) % span + low
+
+    def visit_program(self, node):
+        [decl.accept(self) for decl in node.struct_decls + node.func_decls + node.statement_nodes]
+        node.return_node.accept(self)
+
+    def visit_struct_declaration(self, node):
+        [member_func.accept(self) for member_func in node.member_functions]
+
+    def visit_function_declaration(self, node):
+        self.scopes.append({param.name: None for param in node.params})
+        node.body.accept(self)
+        self.scopes.pop()
+
+    def visit_code_block(self, node):
+        self.scopes.append({})
+        [n.accept(self) for n in node.statements]
+        if node.return_node:
+            node.return_node.accept(self)
+        self.scopes.pop()
+
+    def visit_declaration(self, node):
+        node.expr_node = node.expr_node.accept(self)
+        is_constant = (not node.mutable and self.is_literal(node.expr_node)
+                       and self.literal_type(node.expr_node) == node.data_type)
+        self.scopes[-1][node.variable] = node.expr_node if is_constant else None
+
+    def visit_assignment(self, node):
+        node.expr_node = node.expr_node.accept(self)
+
+    def visit_struct_field_assignment(self, node):
+        node.expr_node = node.expr_node.accept(self)
+
+    def visit_return(self, node):
+        node.expr_node = node.expr_node.accept(self)
+
+    def visit_if_statement(self, node):
+        node.condition = node.condition.accept(self)
+        node.expr_node = node.condition
+        node.then_block.accept(self)
+        if node.else_block:
+            node.else_block.accept(self)
+
+    def visit_id(self, node):
+        for scope in reversed(self.scopes):
+            if node.value in scope:
+                constant = scope[node.value]
+                if constant is None:
+                    return node
+                self.folded_count += 1
+                return type(constant)(constant.value)
+        return node
+
+    def visit_number(self, node):
+        return node
+
+    def visit_boolean(self, node):
+        return node
+
+    def visit_struct_field(self, node):
+        return node
+
+    def visit_struct_initialization(self, node):
+        node.init_expressions = [expr.accept(self) for expr in node.init_expressions]
+        return node
+
+    def visit_function_call(self, node):
+        node.arguments = [arg.accept(self) for arg in node.arguments]
+        return node
+
+    def visit_unary_operation(self, node):
+        node.operand = node.operand.accept(self)
+        if node.operator == NOT and isinstance(node.operand, BooleanNode):
+            self.folded_count += 1
+            flipped = Boolean.FALSE if Boolean.from_string(node.operand.value) == Boolean.TRUE else Boolean.TRUE
+            return BooleanNode(str(flipped))
+        return node
+
+    def visit_binary_operation(self, node):
+        node.left = node.left.accept(self)
+        node.right = node.right.accept(self)
+        if not self.is_literal(node.left) or not self.is_literal(node.right):
+            return node
+
+        folded = (self.__fold_comparison(node) if node.operator.is_for_comparison()
+                  else self.__fold_arithmetic(node))
+        if folded is None:
+            return node
+        self.folded_count += 1
+        return folded
+
+    @staticmethod
+    def __fold_comparison(node) -> BooleanNode:
+        are_equal = node.left.value == node.right.value
+        if isinstance(node.left, NumberNode):
+            are_equal = int(node.left.value) == int(node.right.value)
+        result = are_equal if node.operator == Operator.EQUALS else not are_equal
+        return BooleanNode(str(Boolean.TRUE if result else Boolean.FALSE))
+
+    def __fold_arithmetic(self, node) -> Optional[NumberNode]:
+        left, right = int(node.left.value), int(node.right.value)
+        match node.operator:
+            case Operator.PLUS:
+                value = left + right
+            case Operator.MINUS:
+                value = left - right
+            case Operator.MULTIPLY:
+                value = left * right
+            case _:
+                return None
+
+        result_type = node.result_type if node.result_type else DataType.I32
+        folded = NumberNode(str(self.wrap_integer(value, result_type)))
+        return folded if self.literal_type(folded) == result_type else None
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+from typing import Optional
+from ..analysis.binding_resolver import BindingResolver
+from ...node.assign_node import AssignNode
+from ...node.binary_op_node import BinaryOpNode
+from ...node.decl_node import DeclNode
+from ...node.function_call_node import FunctionCallNode
+from ...node.id_node import IDNode
+from ...node.if_node import IfNode
+from ...node.program_node import ProgramNode
+from ...node.return_node import ReturnNode
+from ...node.struct_field_assign_node import StructFieldAssignNode
+from ...node.struct_field_node import StructFieldNode
+from ...node.struct_init_node import StructInitNode
+from ...node.unary_op_node import UnaryOpNode
+
+LiveSet = set[tuple[DeclNode, tuple[str, ...]]]
+
+
+class DeadCodeEliminator:
+    def __init__(self):
+        self.bindings: dict[int, DeclNode] = {}
+        self.pinned: set[DeclNode] = set()
+        self.rule_counts: dict[str, int] = {}
+
+    def eliminate(self, program: ProgramNode, bindings: Optional[dict[int, DeclNode]] = None):
+        self.bindings = bindings if bindings is not None else BindingResolver().resolve(program)
+        self.pinned = set()
+        functions = program.func_decls + [member_func for struct_decl in program.struct_decls
+                                          for member_func in struct_decl.member_functions]
+        for func_decl in functions:
+            self.__eliminate_block(func_decl.body.statements, func_decl.body.return_node, set())
+        self.__eliminate_block(program.statement_nodes, program.return_node, set())
+
+    def __eliminate_block(self, statements: list, return_node: Optional[ReturnNode], live_out: LiveSet) -> LiveSet:
+        live = self.__uses(return_node.expr_node) if return_node else set(live_out)
+        kept = []
+        for stmt in reversed(statements):
+            rule = self.__find_dead_rule(stmt, live)
+            if rule:
+                self.rule_counts[rule] = self.rule_counts.get(rule, 0) + 1
+                continue
+            live = self.__transfer(stmt, live)
+            kept.append(stmt)
+        statements[:] = kept[::-1]
+        return live
+
+    def __find_dead_rule(self, stmt, live: LiveSet) -> Optional[str]:
+        if isinstance(stmt, DeclNode):
+            is_dead = stmt not in self.pinned and not any(decl is stmt for decl, _ in live)
+            return "dead_declaration" if is_dead and self.__is_pure(stmt.expr_node) else None
+
+        if isinstance(stmt, AssignNode):
+            rule, path = "dead_assignment", ()
+        elif isinstance(stmt, StructFieldAssignNode):
+            rule, path = "dead_field_store", tuple(stmt.target.field_chain.fields[1:])
+        else:
+            return None
+
+        decl = self.bindings.get(id(stmt))
+        if decl is None or self.__is_live(live, decl, path):
+            return None
+        if not self.__is_pure(stmt.expr_node):
+            self.pinned.add(decl)
+            return None
+        return rule
+
+    def __transfer(self, stmt, live: LiveSet) -> LiveSet:
+        if isinstance(stmt, IfNode):
+            then_live = self.__eliminate_block(stmt.then_block.statements, stmt.then_block.return_node, live)
+            else_live = (self.__eliminate_block(stmt.else_block.statements, stmt.else_block.return_node, live)
+                         if stmt.else_block else live)
+            return then_live | else_live | self.__uses(stmt.condition)
+
+        decl = stmt if isinstance(stmt, DeclNode) else self.bindings.get(id(stmt))
+        if isinstance(stmt, DeclNode):
+            live = {(d, path) for d, path in live if d is not decl}
+        elif decl is not None:
+            self.pinned.add(decl)
+            path = tuple(stmt.target.field_chain.fields[1:]) if isinstance(stmt, StructFieldAssignNode) else ()
+            live = {(d, p) for d, p in live if d is not decl or p[:len(path)] != path}
+        return live | self.__uses(stmt.expr_node)
+
+    @staticmethod
+    def __is_live(live: LiveSet, decl: DeclNode, path: tuple[str, ...]) -> bool:
+        return any(d is decl and (p[:len(path)] == path or path[:len(p)] == p) for d, p in live)
+
+    def __uses(self, node) -> LiveSet:
+        decl = self.bindings.get(id(node))
+        if isinstance(node, IDNode):
+            return {(decl, ())} if decl else set()
+        if isinstance(node, StructFieldNode):
+            return {(decl, tuple(node.field_chain.fields[1:]))} if decl else set()
+        if isinstance(node, BinaryOpNode):
+            return self.__uses(node.left) | self.__uses(node.right)
+        if isinstance(node, UnaryOpNode):
+            return self.__uses(node.operand)
+        if isinstance(node, (FunctionCallNode, StructInitNode)):
+            children = node.arguments if isinstance(node, FunctionCallNode) else node.init_expressions
+            uses = {(decl, ())} if decl else set()
+            return uses.union(*(self.__uses(child) for child in children))
+        return set()
+
+    def __is_pure(self, node) -> bool:
+        if isinstance(node, FunctionCallNode):
+            return False
+        if isinstance(node, BinaryOpNode):
+            return self.__is_pure(node.left) and self.__is_pure(node.right)
+        if isinstance(node, UnaryOpNode):
+            return self.__is_pure(node.operand)
+        if isinstance(node, StructInitNode):
+            return all(self.__is_pure(expr) for expr in node.init_expressions)
+        return True
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+import copy
+from typing import Optional
+from .constant_folder import ConstantFolder
+from ..analysis.call_site_collector import CallSiteCollector
+from ..analysis.inline_cost_analyzer import InlineCostAnalyzer
+from ...llvm_specifics.data_type import DataType
+from ...node.decl_node import DeclNode
+from ...node.function_decl_node import FunctionDeclNode
+from ...node.function_call_node import FunctionCallNode
+from ...node.program_node import ProgramNode
+
+MAX_SPECIALIZATIONS_PER_FUNCTION = 4
+
+ConstantKey = tuple[Optional[str], ...]
+
+
+class FunctionSpecializer:
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.spent = 0
+        self.functions: dict[str, FunctionDeclNode] = {}
+        self.member_names: dict[str, set[str]] = {}
+        self.specializations: dict[str, FunctionDeclNode] = {}
+        self.clone_counts: dict[str, int] = {}
+
+    def specialize(self, program: ProgramNode):
+        if self.budget <= 0:
+            return
+
+        self.functions = {func_decl.variable: func_decl for func_decl in program.func_decls}
+        self.member_names = {struct_decl.variable: {member.variable for member in struct_decl.member_functions}
+                             for struct_decl in program.struct_decls}
+
+        self.__propagate_uniform_arguments(self.__collect_call_sites(program))
+        self.__specialize_call_sites(program, self.__collect_call_sites(program))
+        self.__drop_unreferenced_originals(program)
+
+    def __collect_call_sites(self, node) -> list[FunctionCallNode]:
+        return CallSiteCollector(set(self.functions), self.member_names).collect(node)
+
+    def __propagate_uniform_arguments(self, call_sites: list[FunctionCallNode]):
+        calls_by_function: dict[str, list[FunctionCallNode]] = {}
+        for call in call_sites:
+            calls_by_function.setdefault(call.value, []).append(call)
+
+        for func_name, calls in calls_by_function.items():
+            func = self.functions[func_name]
+            keys = [self.__constant_key(func, call) for call in calls]
+            uniform_key = tuple(key_values[0] if len(set(key_values)) == 1 else None
+                                for key_values in zip(*keys))
+
+            if any(value is not None for value in uniform_key):
+                self.__bind_constants(func, uniform_key)
+                [self.__redirect_call(call, func_name, uniform_key) for call in calls]
+
+    def __specialize_call_sites(self, program: ProgramNode, call_sites: list[FunctionCallNode]):
+        worklist: list[tuple[FunctionCallNode, Optional[str]]] = [(call, None) for call in call_sites]
+
+        while worklist:
+            call, cloned_from = worklist.pop(0)
+            func = self.functions[call.value]
+            key = self.__constant_key(func, call)
+            if all(value is None for value in key):
+                continue
+
+            clone_name = self.__mangle(func.variable, key)
+            if clone_name not in self.specializations:
+                clone = self.__create_specialization(func, clone_name, key) if cloned_from != func.variable else None
+                if clone is None:
+                    continue
+                self.specializations[clone_name] = clone
+                program.func_decls.insert(program.func_decls.index(func) + 1, clone)
+                worklist.extend((clone_call, func.variable) for clone_call in self.__collect_call_sites(clone))
+
+            self.__redirect_call(call, clone_name, key)
+
+    def __create_specialization(self, func: FunctionDeclNode, clone_name: str,
+                                key: ConstantKey) -> Optional[FunctionDeclNode]:
+        cost = InlineCostAnalyzer(func.variable).analyze(func).size + 1
+        if self.spent + cost > self.budget or self.clone_counts.get(func.variable, 0) >= MAX_SPECIALIZATIONS_PER_FUNCTION:
+            return None
+
+        self.spent += cost
+        self.clone_counts[func.variable] = self.clone_counts.get(func.variable, 0) + 1
+
+        clone = copy.deepcopy(func)
+        clone.variable = clone_name
+        self.__bind_constants(clone, key)
+        return clone
+
+    @staticmethod
+    def __bind_constants(func: FunctionDeclNode, key: ConstantKey):
+        constant_decls = []
+        remaining_params = []
+
+        for param, value in zip(func.params, key):
+            if value is None:
+                remaining_params.append(param)
+                continue
+            literal = ConstantFolder.literal_from_string(value)
+            constant_decls.append(DeclNode(param.name, literal, func.line, False,
+                                           DataType.from_string(param.param_type)))
+
+        func.params = remaining_params
+        func.body.statements = constant_decls + func.body.statements
+        func.accept(ConstantFolder())
+
+    @staticmethod
+    def __redirect_call(call: FunctionCallNode, target_name: str, key: ConstantKey):
+        call.value = target_name
+        call.arguments = [arg for arg, value in zip(call.arguments, key) if value is None]
+
+    @staticmethod
+    def __constant_key(func: FunctionDeclNode, call: FunctionCallNode) -> ConstantKey:
+        return tuple(ConstantFolder.literal_to_string(arg)
+                     if DataType.is_data_type(param.param_type) and ConstantFolder.is_literal(arg) else None
+                     for param, arg in zip(func.params, call.arguments))
+
+    @staticmethod
+    def __mangle(func_name: str, key: ConstantKey) -> str:
+        return ".".join([func_name] + [value if value is not None else "_" for value in key])
+
+    def __drop_unreferenced_originals(self, program: ProgramNode):
+        outside_functions = ProgramNode(program.struct_decls, [], program.statement_nodes, program.return_node)
+        referenced = {call.value for call in self.__collect_call_sites(outside_functions)}
+        for func_decl in program.func_decls:
+            referenced.update(call.value for call in self.__collect_call_sites(func_decl)
+                              if call.value != func_decl.variable)
+        program.func_decls = [func_decl for func_decl in program.func_decls
+                              if func_decl.variable in referenced or func_decl.variable not in self.clone_counts]
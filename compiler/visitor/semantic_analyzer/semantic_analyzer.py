@@ -24,11 +24,15 @@ class SemanticAnalyzer(ASTVisitor):
         self.function_analyzer = FunctionAnalyzer(self.context, self)
 
     def visit_program(self, node: ProgramNode):
-        [struct_decl.accept(self) for struct_decl in node.struct_decls]
-        [self.function_analyzer.register_function(GLOBAL_SCOPE, func_decl) for func_decl in node.func_decls]
+        self.declare_signatures(node.struct_decls, node.func_decls)
         [func_decl.accept(self) for func_decl in node.func_decls]
         [stmt.accept(self) for stmt in node.statement_nodes]
-        node.return_node.accept(self)
+        if node.return_node:
+            node.return_node.accept(self)
+
+    def declare_signatures(self, struct_decls: list, func_decls: list):
+        [struct_decl.accept(self) for struct_decl in struct_decls]
+        [self.function_analyzer.register_function(GLOBAL_SCOPE, func_decl) for func_decl in func_decls]
 
     def visit_struct_declaration(self, node):
         self.struct_analyzer.visit_struct_declaration(node)
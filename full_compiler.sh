@@ -1,22 +1,27 @@
 #!/bin/bash
 
 mkdir -p llm
-mkdir -p obj
 mkdir -p exe
 
 for i in {1..50}; do
     echo "Testing test_$i..."
-    python3 -m compiler.compiler ./test_cases/test_$i.txt ./llm/test_$i.ll
+    python3 -m compiler.compiler --emit=exe ./test_cases/test_$i.txt ./exe/test_$i
     if [ $? -ne 0 ]; then
         echo "ERROR: test_$i should have compiled successfully!"
         exit 1
     fi
-    llc -filetype=obj -relocation-model=pic ./llm/test_$i.ll -o ./obj/test_$i.o
-    clang -fPIE ./obj/test_$i.o -o ./exe/test_$i
     ./exe/test_$i
     echo ""
 done
 
+echo "Testing test_54 with --verify-each..."
+python3 -m compiler.compiler --verify-each ./test_cases/test_54.txt ./llm/test_54.ll
+if [ $? -ne 0 ]; then
+    echo "ERROR: test_54 should have compiled with --verify-each!"
+    exit 1
+fi
+echo ""
+
 for i in {1..50}; do
     echo "Testing test_$i (should fail)..."
     python3 -m compiler.compiler ./test_cases/test_fail_$i.txt ./llm/test_fail_$i.ll